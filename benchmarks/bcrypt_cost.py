@@ -0,0 +1,67 @@
+"""
+Mide cuántos hashes bcrypt por segundo calcula esta máquina con cada coste,
+para elegir el valor de LIBRARY_BCRYPT_ROUNDS de una instalación.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bcrypt_cost [--min 8] [--max 14] [--target-ms 250] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+import bcrypt
+
+
+def measure(rounds: int, min_seconds: float = 1.0, min_hashes: int = 3) -> dict:
+    """
+    Calcula hashes con 'rounds' durante al menos 'min_seconds' y 'min_hashes'.
+
+    Returns:
+        dict: rounds, hashes, seconds, hashes_per_second y ms_per_hash.
+    """
+    password = b"benchmark-password"
+    hashes = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while hashes < min_hashes or elapsed < min_seconds:
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+        hashes += 1
+        elapsed = time.perf_counter() - start
+    return {
+        "rounds": rounds,
+        "hashes": hashes,
+        "seconds": round(elapsed, 3),
+        "hashes_per_second": round(hashes / elapsed, 2),
+        "ms_per_hash": round(elapsed / hashes * 1000, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rendimiento de bcrypt por coste.")
+    parser.add_argument("--min", type=int, default=8, help="coste mínimo a medir")
+    parser.add_argument("--max", type=int, default=14, help="coste máximo a medir")
+    parser.add_argument("--target-ms", type=float, default=250.0,
+                        help="tiempo máximo aceptable por inicio de sesión")
+    parser.add_argument("--seconds", type=float, default=1.0, help="duración mínima por coste")
+    parser.add_argument("--json", action="store_true", help="salida en JSON")
+    args = parser.parse_args(argv)
+
+    results = [measure(r, min_seconds=args.seconds) for r in range(args.min, args.max + 1)]
+    within = [r["rounds"] for r in results if r["ms_per_hash"] <= args.target_ms]
+    recommended = max(within) if within else args.min
+
+    if args.json:
+        print(json.dumps({"results": results, "target_ms": args.target_ms,
+                          "recommended_rounds": recommended}, indent=2))
+        return 0
+
+    print(f"{'Coste':>5} {'hashes/s':>10} {'ms/hash':>10}")
+    for r in results:
+        print(f"{r['rounds']:>5} {r['hashes_per_second']:>10.2f} {r['ms_per_hash']:>10.1f}")
+    print(f"\nCoste recomendado (≤ {args.target_ms:.0f} ms): {recommended}")
+    print(f"Configúrelo con LIBRARY_BCRYPT_ROUNDS={recommended}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
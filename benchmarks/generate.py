@@ -0,0 +1,220 @@
+"""
+Generador determinista de bibliotecas grandes para los benchmarks.
+
+Crea una base de datos con el esquema de la aplicación (migraciones
+incluidas) y la llena con inserciones masivas (executemany en transacciones
+grandes). Con la misma semilla y la misma fecha final produce exactamente
+los mismos datos.
+
+La popularidad de libros y usuarios sigue una distribución sesgada: pocos
+libros y lectores concentran la mayoría de los préstamos. Todos los usuarios
+comparten la contraseña BENCH_PASSWORD, hasheada una sola vez con un coste
+bajo (BENCH_ROUNDS) para que la generación no dependa de bcrypt.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.generate bench.db --scale large
+    python -m benchmarks.generate bench.db --books 1000000 --users 100000 --loans 10000000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+import bcrypt
+from clases.database import Database
+from clases.statistics import Statistics
+
+BENCH_PASSWORD = "benchmark"
+BENCH_ROUNDS = 4
+
+# Tamaños predefinidos: (libros, usuarios, préstamos)
+SCALES = {
+    "small": (10_000, 1_000, 100_000),
+    "medium": (100_000, 10_000, 1_000_000),
+    "large": (1_000_000, 100_000, 10_000_000),
+}
+
+CATEGORIES = (
+    "Novela", "Ciencia", "Historia", "Infantil", "Poesía", "Ensayo", "Fantasía",
+    "Misterio", "Terror", "Biografía", "Arte", "Filosofía", "Viajes", "Cocina", "Tecnología",
+)
+WORDS = (
+    "sombra", "río", "ciudad", "noche", "jardín", "viaje", "memoria", "mar", "fuego",
+    "silencio", "camino", "tiempo", "luz", "invierno", "montaña", "secreto", "casa",
+    "guerra", "amor", "isla", "libro", "ángel", "reino", "lluvia", "sueño", "viento",
+    "espejo", "puerta", "historia", "última", "nueva", "perdida", "oscura", "eterna",
+)
+NAMES = (
+    "Ana", "Luis", "Marta", "Jorge", "Lucía", "Pablo", "Elena", "Diego", "Sofía",
+    "Carlos", "Laura", "Javier", "Carmen", "Andrés", "Isabel", "Raúl", "Paula", "Hugo",
+)
+SURNAMES = (
+    "García", "Martínez", "López", "Sánchez", "Pérez", "Gómez", "Fernández", "Díaz",
+    "Moreno", "Álvarez", "Romero", "Navarro", "Torres", "Ruiz", "Castro", "Ortega",
+)
+
+BATCH = 50_000
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def skewed(rng: random.Random, n: int, power: float) -> int:
+    """
+    Índice en [0, n) sesgado hacia los primeros valores (mayor 'power', más sesgo).
+    """
+    return int(n * rng.random() ** power)
+
+
+def _batched(rows, size: int = BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _books(rng: random.Random, n: int):
+    authors = [f"{rng.choice(NAMES)} {rng.choice(SURNAMES)} {rng.choice(SURNAMES)}" for _ in range(max(1, n // 20))]
+    for i in range(n):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).capitalize()
+        author = authors[skewed(rng, len(authors), 2.0)]
+        category = CATEGORIES[skewed(rng, len(CATEGORIES), 1.5)]
+        yield (title, f"978{i:010d}", author, category)
+
+
+def _users(n: int, hashed: str):
+    for i in range(n):
+        yield (f"user_{i}", f"user_{i}@bench.example", hashed)
+
+
+def _loans(rng: random.Random, n: int, books: int, users: int, years: int, end: datetime):
+    """
+    Préstamos devueltos, en orden cronológico, con una duración de 1 a 30 días.
+    Las fechas se generan con intervalos exponenciales (llegadas de Poisson),
+    ya ordenadas y sin tener todas en memoria.
+    """
+    span = timedelta(days=365 * years).total_seconds()
+    start = end - timedelta(seconds=span)
+    rate = n / span if n else 1.0
+    offset = 0.0
+    for _ in range(n):
+        offset = min(offset + rng.expovariate(rate), span - 1)
+        loan_date = start + timedelta(seconds=int(offset))
+        return_date = min(loan_date + timedelta(days=rng.randint(1, 30)), end)
+        yield (
+            skewed(rng, books, 3.0) + 1,
+            skewed(rng, users, 2.0) + 1,
+            loan_date.strftime(DATE_FORMAT),
+            return_date.strftime(DATE_FORMAT),
+        )
+
+
+def generate(path: str, books: int, users: int, loans: int, years: int = 10,
+             active_ratio: float = 0.02, seed: int = 42, end: date | None = None,
+             progress=print) -> dict:
+    """
+    Crea (o completa, si está vacía) la base de datos 'path' con datos sintéticos.
+
+    Args:
+        path (str): archivo de la base de datos.
+        books, users, loans (int): número de libros, usuarios y préstamos devueltos.
+        years (int): años de historial.
+        active_ratio (float): fracción de libros con un préstamo activo.
+        seed (int): semilla del generador.
+        end (date | None): fecha final del historial; por defecto hoy.
+        progress: función que recibe mensajes de progreso.
+
+    Returns:
+        dict: parámetros usados y tiempo de generación, para el informe.
+
+    Raises:
+        ValueError: si la base de datos ya contiene libros.
+    """
+    rng = random.Random(seed)
+    end_date = end or date.today()
+    end_dt = datetime.combine(end_date, datetime.min.time())
+    t0 = time.perf_counter()
+
+    db = Database(path, profile="performance")
+    try:
+        if db.select_one("SELECT 1 FROM books LIMIT 1;"):
+            raise ValueError(f"La base de datos {path} ya tiene datos.")
+        hashed = bcrypt.hashpw(BENCH_PASSWORD.encode("utf-8"), bcrypt.gensalt(BENCH_ROUNDS)).decode("utf-8")
+
+        steps = (
+            ("libros", "INSERT INTO books (title, isbn, author, category) VALUES (?, ?, ?, ?);",
+             _books(rng, books), books),
+            ("usuarios", "INSERT INTO users (username, email, password) VALUES (?, ?, ?);",
+             _users(users, hashed), users),
+            ("préstamos", "INSERT INTO loans (book_id, user_id, loan_date, return_date) VALUES (?, ?, ?, ?);",
+             _loans(rng, loans, books, users, years, end_dt), loans),
+        )
+        for label, sql, rows, total in steps:
+            done = 0
+            for batch in _batched(rows):
+                with db.transaction(f"generate.{label}") as cur:
+                    cur.executemany(sql, batch)
+                done += len(batch)
+                progress(f"{label}: {done}/{total}")
+
+        # Préstamos activos: uno por libro en una muestra de libros, con fecha
+        # en las últimas semanas y el libro marcado como no disponible.
+        active_books = rng.sample(range(1, books + 1), int(books * active_ratio)) if books else []
+        active = [
+            (book_id, skewed(rng, users, 2.0) + 1,
+             (end_dt - timedelta(seconds=rng.randrange(30 * 86400))).strftime(DATE_FORMAT))
+            for book_id in active_books
+        ]
+        for batch in _batched(active):
+            with db.transaction("generate.activos") as cur:
+                cur.executemany("INSERT INTO loans (book_id, user_id, loan_date) VALUES (?, ?, ?);", batch)
+                cur.executemany("UPDATE books SET available = 0 WHERE id = ?;", [(b,) for b, _, _ in batch])
+        progress(f"préstamos activos: {len(active)}")
+
+        # Tablas resumen desde cero (más rápido que actualizarlas por préstamo)
+        Statistics(db).rebuild_stats()
+        db.update("ANALYZE;")
+        progress("tablas resumen y ANALYZE")
+    finally:
+        db.close()
+
+    return {
+        "books": books, "users": users, "loans": loans + len(active_books),
+        "active_loans": len(active_books), "years": years, "seed": seed,
+        "end": end_date.isoformat(), "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera una biblioteca sintética para benchmarks.")
+    parser.add_argument("path", help="archivo de la base de datos a crear")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="tamaño predefinido")
+    parser.add_argument("--books", type=int, help="libros (sustituye al de --scale)")
+    parser.add_argument("--users", type=int, help="usuarios (sustituye al de --scale)")
+    parser.add_argument("--loans", type=int, help="préstamos (sustituye al de --scale)")
+    parser.add_argument("--years", type=int, default=10, help="años de historial")
+    parser.add_argument("--seed", type=int, default=42, help="semilla")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="fecha final (AAAA-MM-DD)")
+    args = parser.parse_args(argv)
+
+    books, users, loans = SCALES[args.scale]
+    try:
+        info = generate(
+            args.path,
+            books=args.books if args.books is not None else books,
+            users=args.users if args.users is not None else users,
+            loans=args.loans if args.loans is not None else loans,
+            years=args.years, seed=args.seed, end=args.end,
+            progress=lambda msg: print(f"\r{msg:<60}", end="", flush=True)
+        )
+    except ValueError as e:
+        print("\n[ERROR]", e, file=sys.stderr)
+        return 1
+    print(f"\nGenerada {args.path} en {info['seconds']} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
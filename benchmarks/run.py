@@ -0,0 +1,217 @@
+"""
+Benchmarks de la capa de datos sobre una biblioteca generada.
+
+Mide los listados paginados, la circulación (préstamo y devolución), la
+autenticación y cada consulta de estadísticas, y escribe los resultados en
+JSON para compararlos entre commits.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.run --scale small --output resultados.json
+    python -m benchmarks.run --db bench.db --compare anterior.json
+
+Las pruebas de escritura se ejecutan sobre una copia de la base de datos,
+de modo que la generada no cambia entre ejecuciones.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from clases.book import Book
+from clases.database import Database
+from clases.loan import Loan
+from clases.statistics import Statistics
+from clases.stats_cache import StatsCache
+from clases.user import User
+from benchmarks.generate import BENCH_PASSWORD, BENCH_ROUNDS, SCALES, generate
+
+
+def bench(func, repeat: int = 50, min_seconds: float = 0.5, warmup: int = 2) -> dict:
+    """
+    Ejecuta func() 'repeat' veces como mínimo (y al menos 'min_seconds').
+
+    Returns:
+        dict: runs y los tiempos min, median, mean, p95 y max en ms, más ops_per_s.
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return {
+        "runs": len(times),
+        "min_ms": round(times[0], 4),
+        "median_ms": round(statistics.median(times), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 4),
+        "max_ms": round(times[-1], 4),
+        "ops_per_s": round(1000 * len(times) / sum(times), 2),
+    }
+
+
+def read_cases(db: Database) -> dict:
+    """
+    Casos de solo lectura: listados, historial, autenticación y estadísticas.
+    """
+    book, loan = Book(db), Loan(db)
+    user = User(db, rounds=BENCH_ROUNDS)
+    # Sin caché, para medir el cálculo de cada estadística
+    stats = Statistics(db, cache=StatsCache(ttl=0))
+    max_book = db.select_one("SELECT MAX(id) FROM books;")[0] or 0
+    middle_active = loan.get_active_loans(limit=1 + loan.count_active() // 2)[-1:]
+    middle_history = loan.get_history(limit=1000)[-1:]
+    heavy_user = db.select_one("SELECT user_id FROM loans GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1;")
+
+    cases = {
+        "book.list.first_page": lambda: book.list(limit=100),
+        "book.list.middle_page": lambda: book.list(after_id=max_book // 2, limit=100),
+        "book.list.available.first_page": lambda: book.list(available_only=True, limit=100),
+        "book.count": book.count,
+        "book.search": lambda: book.search("noche sombra", limit=50),
+        "book.search_prefix": lambda: book.search_prefix("mem", limit=20),
+        "loan.get_active_loans.first_page": lambda: loan.get_active_loans(limit=100),
+        "loan.get_history.first_page": lambda: loan.get_history(limit=100),
+        "loan.count_active": loan.count_active,
+        "user.authenticate": lambda: user.authenticate("user_0", BENCH_PASSWORD),
+        "stats.top_books": stats.top_books,
+        "stats.top_authors": stats.top_authors,
+        "stats.loans_by_category": stats.loans_by_category,
+        "stats.loans_per_month": stats.loans_per_month,
+        "stats.recent_loans": stats.recent_loans,
+    }
+    if middle_active:
+        key = (middle_active[0].loan_date, middle_active[0].id)
+        cases["loan.get_active_loans.middle_page"] = lambda: loan.get_active_loans(after=key, limit=100)
+    if middle_history:
+        key = (middle_history[0].loan_date, middle_history[0].id)
+        cases["loan.get_history.page_10"] = lambda: loan.get_history(after=key, limit=100)
+    if heavy_user:
+        cases["loan.get_history.heavy_user"] = lambda: loan.get_history(user_id=heavy_user[0], limit=100)
+    return cases
+
+
+def circulation_case(db: Database, cycles: int) -> dict:
+    """
+    Préstamo y devolución consecutivos de libros disponibles distintos.
+
+    Returns:
+        dict: resultados de bench() para cada ciclo préstamo + devolución.
+    """
+    loan = Loan(db)
+    user_id = db.select_one("SELECT MIN(id) FROM users;")[0]
+    books = iter(r[0] for r in db.select_all(
+        "SELECT id FROM books WHERE available = 1 AND deleted_at IS NULL LIMIT ?;", (cycles * 2 + 10,)
+    ))
+
+    def cycle():
+        book_id = next(books)
+        if loan.lend_book(user_id, book_id) is not True:
+            raise RuntimeError(f"No se pudo prestar el libro {book_id}")
+        loan_id = db.select_one(
+            "SELECT id FROM loans WHERE book_id = ? AND return_date IS NULL;", (book_id,)
+        )[0]
+        loan.return_book(loan_id, book_id)
+
+    return bench(cycle, repeat=cycles, min_seconds=0, warmup=0)
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict) -> list[str]:
+    """
+    Líneas con la variación de la mediana de cada caso frente a otro informe.
+    """
+    lines = []
+    for name, result in current["results"].items():
+        old = previous.get("results", {}).get(name)
+        if not old:
+            continue
+        ratio = result["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        flag = "  ⚠" if ratio > 1.2 else ""
+        lines.append(f"{name:<40} {old['median_ms']:>10.3f} → {result['median_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de la capa de datos.")
+    parser.add_argument("--db", help="base de datos generada (se crea si no existe)")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="tamaño si hay que generarla")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=50, help="repeticiones mínimas por caso")
+    parser.add_argument("--cycles", type=int, default=200, help="ciclos de préstamo/devolución")
+    parser.add_argument("--only", help="ejecutar solo los casos que contengan este texto")
+    parser.add_argument("--output", help="archivo JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument("--compare", help="informe JSON anterior con el que comparar")
+    args = parser.parse_args(argv)
+
+    path = args.db or os.path.join(tempfile.gettempdir(), f"library-bench-{args.scale}-{args.seed}.db")
+    if not os.path.exists(path):
+        books, users, loans = SCALES[args.scale]
+        print(f"Generando {path}…", file=sys.stderr)
+        generate(path, books, users, loans, seed=args.seed, progress=lambda msg: None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Copia de trabajo: las escrituras no alteran la base generada
+        work = os.path.join(tmp, "bench.db")
+        shutil.copyfile(path, work)
+        db = Database(work, readers=2, profile="performance")
+        db.profiler.enabled = False
+        try:
+            dataset = {
+                table: db.select_one(f"SELECT COUNT(*) FROM {table};")[0]
+                for table in ("books", "users", "loans")
+            }
+            results = {}
+            for name, func in read_cases(db).items():
+                if args.only and args.only not in name:
+                    continue
+                print(f"  {name}", file=sys.stderr)
+                results[name] = bench(func, repeat=args.repeat)
+            if not args.only or args.only in "loan.lend_return.cycle":
+                print("  loan.lend_return.cycle", file=sys.stderr)
+                results["loan.lend_return.cycle"] = circulation_case(db, args.cycles)
+        finally:
+            db.close()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "database": os.path.abspath(path),
+        "dataset": dataset,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print("\n".join(compare(report, previous)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
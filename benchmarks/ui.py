@@ -0,0 +1,344 @@
+"""
+Benchmark de respuesta de la interfaz (Tk) sobre una biblioteca generada.
+
+Arranca App contra una copia de la base de datos de benchmarks.generate
+(en un servidor X virtual, Xvfb, si no hay DISPLAY) y mide, con tiempo de
+reloj y memoria (RSS actual y máxima):
+    - construcción de App y de cada pestaña de App.TABS,
+    - refresh() de cada vista hasta que termina su carga en segundo plano,
+    - apertura de cada formulario de views/forms y de cada gráfica de views/stats,
+    - bloqueos del bucle de eventos (pausas del latido de after()) en cada paso.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.ui --scale medium --output ui.json
+    python -m benchmarks.ui --db bench.db --compare ui-anterior.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.generate import SCALES, generate
+from benchmarks.run import compare, git_commit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (nombre del caso, pestaña, método de la vista que abre el formulario)
+FORMS = (
+    ("BookForm", "Libros", "open_form"),
+    ("UserForm", "Usuarios", "open_form"),
+    ("LoanForm", "Préstamos y Devoluciones", "open_form"),
+    ("BatchLoanForm", "Préstamos y Devoluciones", "open_batch_form"),
+)
+
+
+def memory_mb() -> tuple[float, float]:
+    """
+    RSS actual y máxima del proceso en MiB (actual solo en Linux).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024 if sys.platform != "darwin" else peak / 1024 / 1024
+    current_mb = None
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current_mb = int(line.split()[1]) / 1024
+                    break
+    except OSError:
+        pass
+    return current_mb, peak_mb
+
+
+class StallMonitor:
+    """
+    Latido con after(): mide cuánto se retrasa cada tic respecto a su
+    intervalo. Un retraso es el tiempo que el bucle de eventos estuvo
+    bloqueado (la interfaz no respondía).
+    """
+    def __init__(self, app, interval_ms: int = 10):
+        self.app = app
+        self.interval = interval_ms / 1000
+        self.stalls = []        # retrasos (ms) del paso actual
+        self._last = time.perf_counter()
+        self._id = self.app.after(interval_ms, self._tick)
+
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.stalls.append(max(0.0, (now - self._last - self.interval) * 1000))
+        self._last = now
+        self._id = self.app.after(int(self.interval * 1000), self._tick)
+
+
+    def take(self) -> dict:
+        """
+        Resumen de los retrasos desde la última llamada, y reinicio.
+        """
+        stalls, self.stalls = self.stalls, []
+        return {
+            "max_stall_ms": round(max(stalls, default=0.0), 2),
+            "stalls_over_50ms": sum(1 for s in stalls if s > 50),
+            "stalls_over_200ms": sum(1 for s in stalls if s > 200),
+        }
+
+
+    def stop(self):
+        self.app.after_cancel(self._id)
+
+
+class UIBenchmark:
+    """
+    Ejecuta los pasos sobre una App y acumula los resultados.
+    """
+    def __init__(self, app, repeat: int, timeout: float):
+        self.app = app
+        self.repeat = repeat
+        self.timeout = timeout
+        self.monitor = StallMonitor(app)
+        self.results = {}
+
+
+    def pump_until(self, predicate):
+        """
+        Procesa eventos de Tk hasta que predicate() sea cierto.
+        """
+        deadline = time.perf_counter() + self.timeout
+        while not predicate():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("La interfaz no terminó a tiempo.")
+            self.app.update()
+            time.sleep(0.001)
+        self.app.update_idletasks()
+
+
+    def settle(self, ms: int = 100):
+        """
+        Deja correr el bucle de eventos un momento (para descartar retrasos ajenos al paso).
+        """
+        end = time.perf_counter() + ms / 1000
+        while time.perf_counter() < end:
+            self.app.update()
+            time.sleep(0.001)
+        self.monitor.take()
+
+
+    def measure(self, name: str, action, done=lambda: True, repeat: int | None = None, cleanup=None):
+        """
+        Ejecuta action() y espera a done(); registra tiempos, memoria y retrasos.
+        La primera ejecución (fría) se informa aparte de las siguientes.
+        """
+        times = []
+        stalls = []
+        for _ in range(repeat or self.repeat):
+            self.settle()
+            t0 = time.perf_counter()
+            result = action()
+            self.pump_until(done)
+            times.append((time.perf_counter() - t0) * 1000)
+            stalls.append(self.monitor.take())
+            if cleanup is not None:
+                cleanup(result)
+                self.app.update()
+        current, peak = memory_mb()
+        warm = times[1:] or times
+        self.results[name] = {
+            "runs": len(times),
+            "cold_ms": round(times[0], 2),
+            "median_ms": round(statistics.median(warm), 2),
+            "max_ms": round(max(times), 2),
+            "max_stall_ms": max(s["max_stall_ms"] for s in stalls),
+            "stalls_over_50ms": sum(s["stalls_over_50ms"] for s in stalls),
+            "stalls_over_200ms": sum(s["stalls_over_200ms"] for s in stalls),
+            "rss_mb": round(current, 1) if current is not None else None,
+            "peak_rss_mb": round(peak, 1),
+        }
+        print(f"  {name:<40} {self.results[name]['cold_ms']:>9.1f} ms", file=sys.stderr)
+
+
+    @staticmethod
+    def _loaders_idle(view) -> bool:
+        loaders = [getattr(view, "loader", None), getattr(getattr(view, "table", None), "loader", None)]
+        return not any(loader is not None and loader.is_busy() for loader in loaders)
+
+
+    def run_tabs(self, tabs):
+        """
+        Construcción de cada pestaña y su refresh(). La pestaña visible al
+        arrancar ya se construyó dentro de app.startup.
+        """
+        for name, _, class_name in tabs:
+            def build(name=name):
+                self.app.tabview.set(name)
+                return self.app._ensure_view(name)
+            if name not in self.app.views:
+                self.measure(f"tab.{class_name}.build", build,
+                             done=lambda name=name: self._loaders_idle(self.app.views[name]),
+                             repeat=1)
+            view = self.app.views[name]
+            if hasattr(view, "refresh"):
+                self.measure(f"tab.{class_name}.refresh", view.refresh, done=lambda view=view: self._loaders_idle(view))
+
+
+    def run_forms(self):
+        """
+        Apertura de cada formulario de views/forms (se cierra tras medirlo).
+        """
+        for case, tab, method in FORMS:
+            view = self.app._ensure_view(tab)
+            self.app.tabview.set(tab)
+
+            def open_form(view=view, method=method):
+                before = set(view.winfo_children())
+                getattr(view, method)()
+                return [w for w in view.winfo_children() if w not in before]
+
+            def close(windows):
+                for window in windows:
+                    window.destroy()
+
+            self.measure(f"form.{case}.open", open_form, cleanup=close)
+
+
+    def run_stats(self, stats_view):
+        """
+        Apertura de cada gráfica de views/stats (datos en segundo plano
+        incluidos) y del panel en vivo.
+        """
+        for module, class_name, method in stats_view.CHARTS:
+            form_cls = getattr(importlib.import_module(module), class_name)
+
+            def show(module=module, class_name=class_name, method=method):
+                stats_view._open(module, class_name, getattr(stats_view.stats, method))
+
+            def opened(form_cls=form_cls):
+                window = form_cls._instances.get(form_cls)
+                return window is not None and window.winfo_exists()
+
+            def close(_, form_cls=form_cls):
+                window = form_cls._instances.get(form_cls)
+                if window is not None:
+                    window.close()
+
+            self.measure(f"stats.{class_name}.open", show, done=opened, cleanup=close)
+
+        def dashboard_ready():
+            dashboard = stats_view.dashboard
+            return dashboard is not None and all(p.data is not None for p in dashboard.panels)
+
+        def close_dashboard(_):
+            if stats_view.dashboard is not None:
+                stats_view.toggle_dashboard()
+
+        self.measure("stats.StatsDashboard.open", stats_view.toggle_dashboard,
+                     done=dashboard_ready, cleanup=close_dashboard)
+
+
+def start_xvfb(display: str = ":99") -> subprocess.Popen:
+    """
+    Inicia Xvfb en 'display' y lo fija como DISPLAY.
+
+    Raises:
+        RuntimeError: si Xvfb no está instalado o no arranca.
+    """
+    try:
+        proc = subprocess.Popen(
+            ["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except OSError as e:
+        raise RuntimeError(f"No se pudo iniciar Xvfb: {e}") from None
+    time.sleep(0.5)
+    if proc.poll() is not None:
+        raise RuntimeError(f"Xvfb terminó al arrancar (¿display {display} ocupado?).")
+    os.environ["DISPLAY"] = display
+    return proc
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de respuesta de la interfaz.")
+    parser.add_argument("--db", help="base de datos generada (se crea si no existe)")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="tamaño si hay que generarla")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones por caso")
+    parser.add_argument("--timeout", type=float, default=60.0, help="espera máxima por caso (s)")
+    parser.add_argument("--display", default=":99", help="display de Xvfb")
+    parser.add_argument("--xvfb", action="store_true", help="usar Xvfb aunque haya DISPLAY")
+    parser.add_argument("--output", help="archivo JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument("--compare", help="informe JSON anterior con el que comparar")
+    args = parser.parse_args(argv)
+
+    path = os.path.abspath(args.db or os.path.join(tempfile.gettempdir(), f"library-bench-{args.scale}-{args.seed}.db"))
+    if not os.path.exists(path):
+        books, users, loans = SCALES[args.scale]
+        print(f"Generando {path}…", file=sys.stderr)
+        generate(path, books, users, loans, seed=args.seed, progress=lambda msg: None)
+
+    xvfb = start_xvfb(args.display) if args.xvfb or not os.environ.get("DISPLAY") else None
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # App abre 'library.db' en el directorio actual: se trabaja sobre una copia
+            shutil.copyfile(path, os.path.join(tmp, "library.db"))
+            os.chdir(tmp)
+            if PROJECT_ROOT not in sys.path:
+                sys.path.insert(0, PROJECT_ROOT)
+
+            t0 = time.perf_counter()
+            import main as app_module
+            app = app_module.App()
+            app.update()
+            startup_ms = (time.perf_counter() - t0) * 1000
+
+            bench = UIBenchmark(app, repeat=args.repeat, timeout=args.timeout)
+            current, peak = memory_mb()
+            bench.results["app.startup"] = {
+                "runs": 1, "cold_ms": round(startup_ms, 2), "median_ms": round(startup_ms, 2),
+                "max_ms": round(startup_ms, 2),
+                "rss_mb": round(current, 1) if current is not None else None,
+                "peak_rss_mb": round(peak, 1),
+            }
+            try:
+                bench.run_tabs(app_module.App.TABS)
+                bench.run_forms()
+                bench.run_stats(app.views["Estadísticas"])
+            finally:
+                bench.monitor.stop()
+                app.on_closing()
+            dataset = {"database": path}
+    finally:
+        os.chdir(cwd)
+        if xvfb is not None:
+            xvfb.terminate()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dataset": dataset,
+        "results": bench.results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(os.path.join(cwd, args.output), "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(os.path.join(cwd, args.compare), encoding="utf-8") as f:
+            previous = json.load(f)
+        print("\n".join(compare(report, previous)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,34 @@
+import csv
+import re
+import sqlite3
 from datetime import datetime
+from pathlib import Path
 from clases.database import Database
+from clases.records import BookRecord
+from clases.statistics import Statistics
 
 class Book:
     """
     Gestión de libros, incluyendo validación de unicidad y estado de préstamo.
     """
+    SEARCH_LIMIT = 200
+
+    # Columnas obligatorias de un CSV de importación y filas por transacción.
+    IMPORT_COLUMNS = ("title", "isbn", "author", "category")
+    IMPORT_BATCH = 5000
+
     def __init__(self, db: Database):
         self.db = db
 
 
+    @staticmethod
+    def normalize_isbn(isbn: str) -> str:
+        """
+        Normaliza un ISBN quitando guiones y espacios y pasando a mayúsculas.
+        """
+        return isbn.replace('-', '').replace(' ', '').upper()
+
+
     def _validate_uniqueness(self, isbn: str, current_id: int | None = None) -> dict:
         """
         Verifica si el ISBN ya está registrado para otro libro.
@@ -20,7 +40,7 @@ class Book:
         Returns:
             dict: Diccionario de errores ('isbn' si falla).
         """
-        isbn_clean = isbn.replace('-', '').replace(' ', '').upper()
+        isbn_clean = self.normalize_isbn(isbn)
         
         query = "SELECT id FROM books WHERE isbn=? AND deleted_at IS NULL"
         params = (isbn_clean,)
@@ -35,16 +55,37 @@ class Book:
         return {}
 
 
-    def get_by_id(self, book_id: int) -> tuple | None:
+    def get_by_id(self, book_id: int) -> BookRecord | None:
         """
         Obtener un libro activo por ID.
         """
         return self.db.select_one(
             "SELECT id, title, isbn, author, category, available FROM books WHERE id=? AND deleted_at IS NULL;", 
-            (book_id,)
+            (book_id,), record=BookRecord
         )
 
 
+    def get_ids_by_isbn(self, isbns: list[str]) -> dict[str, int]:
+        """
+        Resuelve una lista de ISBN a IDs de libros activos con consultas por lotes.
+
+        Args:
+            isbns (list[str]): ISBN tal como se escanearon (se normalizan).
+
+        Returns:
+            dict[str, int]: {isbn normalizado: id} de los ISBN encontrados.
+        """
+        clean = list(dict.fromkeys(self.normalize_isbn(i) for i in isbns))
+        found = {}
+        for batch, marks in self.db.chunks(clean):
+            rows = self.db.select_all(
+                f"SELECT isbn, id FROM books WHERE deleted_at IS NULL AND isbn IN ({marks});",
+                tuple(batch)
+            )
+            found.update(rows)
+        return found
+
+
     @staticmethod
     def validate(title: str, isbn: str, author: str, category: str) -> dict:
         """
@@ -59,6 +100,126 @@ class Book:
         return errors
 
 
+    def import_csv(self, path: str, rejects_path: str | None = None,
+                   batch_size: int = IMPORT_BATCH, progress=None) -> dict:
+        """
+        Importa libros desde un CSV con cabecera title,isbn,author,category.
+
+        El archivo se lee por lotes de 'batch_size' filas. Cada lote se valida
+        con las mismas reglas que create() (ISBN normalizado), comprueba la
+        unicidad con una consulta 'IN' por lote y se inserta con executemany
+        en una transacción. Las filas rechazadas se escriben, con su número de
+        línea y el motivo, en 'rejects_path' (por defecto '<archivo>.rejects.csv').
+
+        Cada lote queda confirmado al terminar, así que si la base de datos falla
+        a mitad se devuelve el resumen de lo ya importado con la clave 'error'.
+        Los libros ya registrados con los mismos datos se omiten (no se
+        rechazan), de modo que reimportar el mismo archivo continúa donde se
+        quedó sin duplicar nada.
+
+        Args:
+            path (str): ruta del CSV (UTF-8, se admite BOM).
+            rejects_path (str | None): ruta del informe de rechazos.
+            batch_size (int): filas por lote y transacción.
+            progress: función opcional progress(leídas, importadas) tras cada lote.
+
+        Returns:
+            dict: read, imported, skipped, rejected, rejects_path (None si no hubo
+                rechazos) y error (None, o el mensaje si la base de datos falló).
+
+        Raises:
+            ValueError: si faltan columnas obligatorias en la cabecera.
+            OSError: si no se puede leer el archivo o escribir el informe.
+        """
+        if rejects_path is None:
+            rejects_path = str(Path(path).with_suffix("")) + ".rejects.csv"
+        summary = {
+            "read": 0, "imported": 0, "skipped": 0, "rejected": 0,
+            "rejects_path": None, "error": None,
+        }
+        seen = set()           # ISBN ya aceptados en este archivo
+        rejects_file = None
+        rejects = None
+
+        def reject(line: int, row: dict, reason: str):
+            nonlocal rejects_file, rejects
+            if rejects is None:
+                rejects_file = open(rejects_path, "w", newline="", encoding="utf-8")
+                rejects = csv.writer(rejects_file)
+                rejects.writerow(("line",) + self.IMPORT_COLUMNS + ("error",))
+                summary["rejects_path"] = rejects_path
+            rejects.writerow([line] + [row.get(c) or "" for c in self.IMPORT_COLUMNS] + [reason])
+            summary["rejected"] += 1
+
+        def flush(batch: list):
+            # Unicidad frente a la base de datos (también libros borrados: el
+            # índice UNIQUE de 'isbn' los incluye)
+            existing = {}
+            for chunk, marks in self.db.chunks([values[1] for _, _, values in batch]):
+                rows = self.db.select_all(f"""
+                    SELECT title, isbn, author, category, deleted_at IS NULL
+                    FROM books WHERE isbn IN ({marks});
+                """, tuple(chunk))
+                existing.update((r[1], r) for r in rows)
+            accepted = []
+            for line, row, values in batch:
+                found = existing.get(values[1])
+                if found is None:
+                    accepted.append(values)
+                elif found[:4] == values and found[4]:
+                    summary["skipped"] += 1   # ya importado (p. ej. en un intento anterior)
+                else:
+                    reject(line, row, "ISBN ya registrado en la biblioteca.")
+            if accepted:
+                with self.db.transaction("Book.import_csv") as cur:
+                    cur.executemany(
+                        "INSERT INTO books (title, isbn, author, category) VALUES (?, ?, ?, ?);",
+                        accepted
+                    )
+                summary["imported"] += len(accepted)
+
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                missing = [c for c in self.IMPORT_COLUMNS if c not in (reader.fieldnames or ())]
+                if missing:
+                    raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+                batch = []
+                for row in reader:
+                    summary["read"] += 1
+                    line = reader.line_num
+                    title, isbn, author, category = ((row.get(c) or "").strip() for c in self.IMPORT_COLUMNS)
+                    errors = self.validate(title, isbn, author, category)
+                    if errors:
+                        reject(line, row, "; ".join(f"{k}: {v}" for k, v in errors.items()))
+                        continue
+                    isbn_clean = self.normalize_isbn(isbn)
+                    if isbn_clean in seen:
+                        reject(line, row, "ISBN repetido en el archivo.")
+                        continue
+                    seen.add(isbn_clean)
+                    batch.append((line, row, (title, isbn_clean, author, category)))
+                    if len(batch) >= batch_size:
+                        flush(batch)
+                        batch = []
+                        if progress:
+                            progress(summary["read"], summary["imported"])
+                if batch:
+                    flush(batch)
+                if progress:
+                    progress(summary["read"], summary["imported"])
+        except sqlite3.Error as e:
+            # Los lotes anteriores ya están confirmados: se informa de cuántos
+            print("[ERROR] import_csv:", e)
+            summary["error"] = str(e)
+        finally:
+            if rejects_file is not None:
+                rejects_file.close()
+            if summary["imported"]:
+                self.db.notify_change("books")
+        return summary
+
+
     def create(self, title: str, isbn: str, author: str, category: str) -> bool | dict:
         """
         Agregar un libro a la biblioteca, verificando unicidad del ISBN.
@@ -66,7 +227,7 @@ class Book:
         Returns:
             bool | dict: True si se agregó, o dict de errores de unicidad si falla.
         """
-        isbn_clean = isbn.replace('-', '').replace(' ', '').upper()
+        isbn_clean = self.normalize_isbn(isbn)
 
         # Validación de unicidad
         errors = self._validate_uniqueness(isbn_clean)
@@ -83,6 +244,7 @@ class Book:
             # Error genérico de DB (ej. conexión)
             return {'general': 'Fallo al insertar el registro en la base de datos.'}
         
+        self.db.notify_change("books")
         return True
 
 
@@ -93,21 +255,35 @@ class Book:
         Returns:
             bool | dict: True si se actualizó, o dict de errores de unicidad si falla.
         """
-        isbn_clean = isbn.replace('-', '').replace(' ', '').upper()
+        isbn_clean = self.normalize_isbn(isbn)
         
         # Validación de unicidad (excluyendo el libro actual)
         errors = self._validate_uniqueness(isbn_clean, book_id)
         if errors:
             return errors
         
-        # Actualización
-        result = self.db.update(
-            "UPDATE books SET title=?, isbn=?, author=?, category=? "
-            "WHERE id=? AND deleted_at IS NULL;",
-            (title, isbn_clean, author, category, book_id)
-        )
+        # Actualización (y traslado de sus préstamos en las tablas resumen
+        # si cambian autor o categoría), en una sola transacción
+        try:
+            with self.db.transaction("Book.update") as cur:
+                old = cur.execute(
+                    "SELECT author, category FROM books WHERE id=? AND deleted_at IS NULL;",
+                    (book_id,)
+                ).fetchone()
+                if not old:
+                    return False
+                cur.execute(
+                    "UPDATE books SET title=?, isbn=?, author=?, category=? "
+                    "WHERE id=? AND deleted_at IS NULL;",
+                    (title, isbn_clean, author, category, book_id)
+                )
+                Statistics.move_book(cur, book_id, tuple(old), (author, category))
+        except sqlite3.Error as e:
+            print("[ERROR] update book:", e)
+            return False
         
-        return result
+        self.db.notify_change("books")
+        return True
 
 
     def soft_delete(self, book_id: int) -> bool | dict:
@@ -133,17 +309,127 @@ class Book:
         if not result:
             return {'general': 'Error desconocido al intentar eliminar el libro.'}
             
+        self.db.notify_change("books")
         return True
 
 
-    def list(self, available_only: bool = False) -> list[tuple]:
+    def search_prefix(self, prefix: str, available_only: bool = True, limit: int = 20) -> list[BookRecord]:
+        """
+        Libros activos cuyo título empieza por 'prefix' (sin distinguir
+        mayúsculas) y, si parece un ISBN, también aquellos cuyo ISBN empieza
+        por él. Cada búsqueda usa su índice (idx_books_title_nocase y el
+        único de 'isbn').
+
+        Returns:
+            list: Lista de BookRecord: primero las coincidencias por ISBN y
+                después las de título, cada grupo en su orden.
         """
-        Lista los libros disponibles o todos los activos.
+        prefix = prefix.strip()
+        clean = self.normalize_isbn(prefix)
+        ranges = []
+        if len(clean) >= 3 and clean[:-1].isdigit():
+            ranges.append(("isbn", *self.db.prefix_range(clean)))
+        # Los títulos numéricos ("1984") también se buscan por título
+        ranges.append(("title COLLATE NOCASE", *self.db.prefix_range(prefix)))
+
+        found = {}
+        for column, lo, hi in ranges:
+            query = f"""
+                SELECT id, title, isbn, author, category, available FROM books
+                WHERE deleted_at IS NULL AND {column} >= ? AND {column} < ?
+            """
+            if available_only:
+                query += " AND available = 1"
+            query += f" ORDER BY {column} LIMIT ?;"
+            for book in self.db.select_all(query, (lo, hi, limit - len(found)), record=BookRecord):
+                found.setdefault(book.id, book)
+            if len(found) >= limit:
+                break
+        return list(found.values())
+
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """
+        Convierte el texto escrito por el usuario en una consulta FTS5: cada
+        palabra se busca como prefijo y todas deben aparecer. Las palabras se
+        entrecomillan para que los operadores de FTS5 no se interpreten.
+        """
+        words = re.findall(r"\w+", query)
+        return " ".join(f'"{w}"*' for w in words)
+
+
+    def search(self, query: str, category: str | None = None, available_only: bool = False,
+               limit: int = SEARCH_LIMIT) -> list[BookRecord]:
+        """
+        Busca libros activos por título, autor o categoría usando el índice
+        de texto completo (books_fts). Cada palabra coincide por prefijo y sin
+        distinguir mayúsculas ni acentos ("garcia mar" encuentra "García Márquez").
+
+        Args:
+            query (str): texto a buscar.
+            category (str | None): limitar a esta categoría exacta.
+            available_only (bool): solo libros disponibles.
+            limit (int): número máximo de resultados.
+
+        Returns:
+            list: Lista de BookRecord, de más a menos relevante.
+        """
+        match = self._match_expression(query)
+        if not match:
+            return []
+        sql = """
+            SELECT b.id, b.title, b.isbn, b.author, b.category, b.available
+            FROM books_fts f
+            INNER JOIN books b ON b.id = f.rowid
+            WHERE books_fts MATCH ? AND b.deleted_at IS NULL
+        """
+        params = [match]
+        if category is not None:
+            sql += " AND b.category = ?"
+            params.append(category)
+        if available_only:
+            sql += " AND b.available = 1"
+        sql += " ORDER BY f.rank LIMIT ?;"
+        params.append(limit)
+        return self.db.select_all(sql, tuple(params), record=BookRecord)
+
+
+    def list(self, available_only: bool = False, after_id: int | None = None,
+             before_id: int | None = None, limit: int | None = None) -> list[BookRecord]:
+        """
+        Lista los libros disponibles o todos los activos, ordenados por ID.
+
+        Admite paginación por clave (keyset): 'after_id' devuelve la página
+        siguiente a ese ID y 'before_id' la anterior.
+
+        Args:
+            available_only (bool): solo libros disponibles.
+            after_id (int | None): ID del último libro de la página actual.
+            before_id (int | None): ID del primer libro de la página actual.
+            limit (int | None): tamaño máximo de la página.
+
+        Returns:
+            list: Lista de BookRecord (id, title, isbn, author, category, available).
         """
         query = "SELECT id, title, isbn, author, category, available FROM books WHERE deleted_at IS NULL"
-        params = ()
         if available_only:
-            query += " AND available = ?"
-            params = (1,)
-        query += " ORDER BY id ASC;"
-        return self.db.select_all(query, params)
\ No newline at end of file
+            query += " AND available = 1"
+        return self.db.keyset(
+            query,
+            after=None if after_id is None else (after_id,),
+            before=None if before_id is None else (before_id,),
+            limit=limit, record=BookRecord
+        )
+
+
+    def count(self, available_only: bool = False) -> int:
+        """
+        Cuenta los libros activos (o solo los disponibles).
+        """
+        query = "SELECT COUNT(*) FROM books WHERE deleted_at IS NULL"
+        if available_only:
+            query += " AND available = 1"
+        row = self.db.select_one(query + ";")
+        return row[0] if row else 0
+
@@ -1,21 +1,89 @@
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
+from clases import migrations
+from clases.login_throttle import LoginThrottle
+from clases.query_profiler import ProfiledCursor, QueryProfiler
+from clases.records import row_factory
+from clases.session_cache import SessionCache
 
 class Database:
     """
     Gestión de conexión y operaciones básicas con SQLite.
+
+    Usa una única conexión de escritura (serializada con un lock) y,
+    opcionalmente, un pool de conexiones de solo lectura para que las
+    consultas SELECT puedan ejecutarse en paralelo desde hilos de trabajo.
     """
-    def __init__(self, db_name="library.db"):
+    # Perfiles de PRAGMA aplicados al conectar. 'default' conserva los
+    # valores de SQLite; 'performance' activa WAL y relaja los fsync.
+    PROFILES = {
+        "default": {},
+        "performance": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -65536,       # 64 MiB (valor negativo = KiB)
+            "mmap_size": 268435456,     # 256 MiB
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,       # ms
+        },
+        "durable": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "busy_timeout": 5000,
+        },
+    }
+
+    # PRAGMAs que pueden configurarse y que reporta pragma_report().
+    PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+    # PRAGMAs que afectan al archivo y solo los fija la conexión de escritura.
+    _WRITER_ONLY_PRAGMAS = ("journal_mode", "synchronous")
+
+    # Tamaño de lote para consultas 'IN (?, ?, ...)' (límite de variables SQL).
+    IN_CHUNK = 500
+
+    # Sentencias preparadas que sqlite3 guarda por conexión. La aplicación
+    # usa un conjunto fijo de consultas (más de las 128 por defecto).
+    STATEMENT_CACHE = 256
+
+    # Filas leídas por lote en select_columns.
+    COLUMN_BATCH = 10000
+
+    def __init__(self, db_name="library.db", readers: int = 0, profile: str | dict = "default",
+                 profiler: QueryProfiler | None = None):
         """
         Inicializa la conexión a la base de datos y crea las tablas si no existen.
         
         Args:
             db_name (str): nombre del archivo de la base de datos.
+            readers (int): número de conexiones de solo lectura del pool.
+                Con 0 todas las consultas usan la conexión de escritura.
+            profile (str | dict): nombre de un perfil de PROFILES o un dict
+                {pragma: valor} con una configuración propia.
+            profiler (QueryProfiler | None): estadísticas de las sentencias
+                ejecutadas (consultas, transacciones y migraciones); por defecto uno nuevo.
         """
         self.db_name = db_name
+        self.pragmas = self._resolve_profile(profile)
+        # Una BD en memoria no puede compartirse entre conexiones.
+        self.readers = 0 if db_name == ":memory:" else max(0, readers)
         self._connection = None
+        self._write_lock = threading.RLock()
+        self._reader_pool = None
+        self._cursors = {}        # conexión -> cursor reutilizable
+        self._listeners = []
+        self.profiler = profiler or QueryProfiler()
+        # Estado de autenticación compartido por todas las instancias de User
+        self.login_throttle = LoginThrottle()
+        self.sessions = SessionCache()
         self._connect()
         self._setup_tables()
+        self._open_readers()
 
 
     def _connect(self):
@@ -23,13 +91,157 @@ class Database:
         Establece la conexión a la base de datos y configura sqlite3.
         """
         try:
-            self._connection = sqlite3.connect(self.db_name)
-            self._connection.row_factory = sqlite3.Row
+            self._connection = sqlite3.connect(
+                self.db_name, check_same_thread=False, cached_statements=self.STATEMENT_CACHE
+            )
+            self._apply_pragmas(self._connection, writer=True)
         except sqlite3.Error as e:
             print("[ERROR] Conexión a la base de datos:", e)
             self._connection = None
 
 
+    def _resolve_profile(self, profile: str | dict) -> dict:
+        """
+        Obtiene el diccionario de PRAGMAs de un perfil, validando sus claves.
+        """
+        if isinstance(profile, str):
+            if profile not in self.PROFILES:
+                raise ValueError(f"Perfil de base de datos desconocido: {profile}")
+            profile = self.PROFILES[profile]
+        unknown = set(profile) - set(self.PRAGMAS)
+        if unknown:
+            raise ValueError(f"PRAGMA no soportado: {', '.join(sorted(unknown))}")
+        return dict(profile)
+
+
+    def _apply_pragmas(self, conn: sqlite3.Connection, writer: bool):
+        """
+        Aplica los PRAGMAs del perfil activo a una conexión.
+        """
+        for name, value in self.pragmas.items():
+            if not writer and name in self._WRITER_ONLY_PRAGMAS:
+                continue
+            conn.execute(f"PRAGMA {name}={value}")
+
+
+    def _open_readers(self):
+        """
+        Abre el pool de conexiones de solo lectura (modo 'ro' de SQLite).
+        """
+        if not self._connection or self.readers == 0:
+            return
+        uri = Path(self.db_name).resolve().as_uri() + "?mode=ro"
+        pool = queue.Queue(maxsize=self.readers)
+        try:
+            for _ in range(self.readers):
+                conn = sqlite3.connect(
+                    uri, uri=True, check_same_thread=False, cached_statements=self.STATEMENT_CACHE
+                )
+                self._apply_pragmas(conn, writer=False)
+                pool.put(conn)
+        except sqlite3.Error as e:
+            print("[ERROR] Pool de lectura:", e)
+            while not pool.empty():
+                pool.get().close()
+            return
+        self._reader_pool = pool
+
+
+    @contextmanager
+    def _writer(self):
+        """
+        Entrega la conexión de escritura en exclusiva al hilo actual.
+
+        Raises:
+            sqlite3.ProgrammingError: si la base de datos se cerró mientras
+                se esperaba el lock.
+        """
+        with self._write_lock:
+            if self._connection is None:
+                raise sqlite3.ProgrammingError("La base de datos está cerrada.")
+            yield self._connection
+
+
+    @contextmanager
+    def _reader(self):
+        """
+        Entrega una conexión de lectura del pool durante una consulta.
+
+        Si no hay pool, o todas sus conexiones están ocupadas, se usa la
+        conexión de escritura bajo su lock: así una lectura del hilo de la
+        interfaz nunca espera a que terminen las consultas en segundo plano.
+        """
+        pool = self._reader_pool
+        conn = None
+        if pool is not None:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                pass
+        if conn is None:
+            with self._writer() as conn:
+                yield conn
+            return
+        try:
+            yield conn
+        finally:
+            # Si close() se llamó mientras se usaba, se cierra al devolverla
+            if self._reader_pool is pool:
+                pool.put(conn)
+            else:
+                conn.close()
+
+
+    def _cursor(self, conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """
+        Cursor reutilizable de una conexión, para sentencias que se leen
+        completas antes de liberar la conexión (insert, update, select_all).
+        Las filas son tuplas simples (sin row_factory).
+        """
+        cur = self._cursors.get(conn)
+        if cur is None:
+            cur = self._cursors[conn] = conn.cursor()
+        return cur
+
+
+    @contextmanager
+    def transaction(self, name: str | None = None):
+        """
+        Abre una transacción BEGIN IMMEDIATE en la conexión de escritura.
+
+        El lock de escritura se toma al entrar, por lo que las operaciones del
+        bloque se confirman en un único COMMIT; ante una excepción se hace
+        ROLLBACK y la excepción se propaga.
+
+        Cada sentencia del cursor se registra en el profiler, y el bloque
+        completo (hasta el COMMIT) como "TRANSACTION <name>".
+
+        Args:
+            name (str | None): nombre del bloque en el profiler (p. ej. "Loan.lend_book").
+
+        Yields:
+            ProfiledCursor: cursor de la conexión de escritura.
+
+        Raises:
+            sqlite3.Error: si no hay conexión o falla alguna sentencia.
+        """
+        if not self._connection:
+            raise sqlite3.OperationalError("Sin conexión a la base de datos.")
+        with self._writer() as conn:
+            start = time.perf_counter()
+            try:
+                conn.execute("BEGIN IMMEDIATE;")
+                try:
+                    yield ProfiledCursor(conn.cursor(), self._profile)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            finally:
+                self._profile_block(f"TRANSACTION {name}" if name else "TRANSACTION",
+                                    time.perf_counter() - start)
+
+
     def insert(self, query: str, params: tuple = ()) -> int | None:
         """
         Ejecuta un INSERT y retorna el ID de la fila insertada.
@@ -37,10 +249,13 @@ class Database:
         if not self._connection:
             return None
         try:
-            with self._connection as conn:
-                cur = conn.cursor()
+            start = time.perf_counter()
+            with self._writer() as conn, conn:
+                cur = self._cursor(conn)
                 cur.execute(query, params)
-                return cur.lastrowid
+                row_id, count = cur.lastrowid, cur.rowcount
+            self._profile(query, params, time.perf_counter() - start, count)
+            return row_id
         except sqlite3.Error as e:
             print("[ERROR] insert:", e)
             return None
@@ -53,10 +268,13 @@ class Database:
         if not self._connection:
             return False
         try:
-            with self._connection as conn:
-                cur = conn.cursor()
+            start = time.perf_counter()
+            with self._writer() as conn, conn:
+                cur = self._cursor(conn)
                 cur.execute(query, params)
-                return True
+                count = cur.rowcount
+            self._profile(query, params, time.perf_counter() - start, count)
+            return True
         except sqlite3.Error as e:
             print("[ERROR] update:", e)
             return False
@@ -69,74 +287,282 @@ class Database:
         return self.update(query, params)
 
 
-    def select_one(self, query: str, params: tuple = ()) -> tuple | None:
+    def select_one(self, query: str, params: tuple = (), record: type | None = None) -> tuple | None:
         """
-        Ejecuta un SELECT y retorna una fila como tupla.
+        Ejecuta un SELECT y retorna una fila como tupla, o como 'record'
+        (una clase de clases/records.py) si se indica.
         """
         if not self._connection:
             return None
         try:
-            with self._connection as conn:
+            start = time.perf_counter()
+            # Cursor propio: al descartarlo se cierra la sentencia a medio leer
+            # (un cursor reutilizado la dejaría abierta con su instantánea).
+            with self._reader() as conn:
                 cur = conn.cursor()
-                cur.execute(query, params)
-                row = cur.fetchone()
-                return tuple(row) if row else None
+                cur.row_factory = record and row_factory(record)
+                row = cur.execute(query, params).fetchone()
+            self._profile(query, params, time.perf_counter() - start, 1 if row else 0)
+            return row
         except sqlite3.Error as e:
             print("[ERROR] select_one:", e)
             return None
 
 
-    def select_all(self, query: str, params: tuple = ()) -> list[tuple]:
+    def select_all(self, query: str, params: tuple = (), record: type | None = None) -> list[tuple]:
         """
-        Ejecuta un SELECT y retorna varias filas como lista de tuplas.
+        Ejecuta un SELECT y retorna varias filas como lista de tuplas, o de
+        'record' (una clase de clases/records.py) si se indica.
         """
         if not self._connection:
             return []
         try:
-            with self._connection as conn:
-                cur = conn.cursor()
-                cur.execute(query, params)
-                return [tuple(r) for r in cur.fetchall()]
+            start = time.perf_counter()
+            with self._reader() as conn:
+                cur = self._cursor(conn)
+                cur.row_factory = record and row_factory(record)
+                rows = cur.execute(query, params).fetchall()
+            self._profile(query, params, time.perf_counter() - start, len(rows))
+            return rows
         except sqlite3.Error as e:
             print("[ERROR] select_all:", e)
             return []
 
 
+    def keyset(self, query: str, params: tuple = (), key_cols: tuple = ("id",),
+               after: tuple | None = None, before: tuple | None = None,
+               limit: int | None = None, desc: bool = False, record: type | None = None) -> list:
+        """
+        Página de un SELECT con paginación por clave (keyset) sobre 'key_cols'.
+
+        'after' y 'before' se refieren al orden mostrado: 'after' es la clave
+        de la última fila de la página actual (devuelve la página siguiente) y
+        'before' la de la primera (devuelve la anterior). Para retroceder se
+        recorre en orden inverso y se reordena la página.
+
+        Args:
+            query (str): SELECT con su WHERE y sin ORDER BY ni LIMIT.
+            key_cols (tuple): columnas de la clave, únicas en conjunto.
+            desc (bool): orden mostrado descendente.
+
+        Returns:
+            list: filas (o 'record') en el orden mostrado.
+        """
+        # Comparación de valores de fila '(a, b) > (?, ?)', que usa el índice de la clave
+        cols, marks = ", ".join(key_cols), ", ".join("?" * len(key_cols))
+        if len(key_cols) > 1:
+            cols, marks = f"({cols})", f"({marks})"
+        params = list(params)
+        if after is not None:
+            query += f" AND {cols} {'<' if desc else '>'} {marks}"
+            params.extend(after)
+        if before is not None:
+            query += f" AND {cols} {'>' if desc else '<'} {marks}"
+            params.extend(before)
+        backwards = before is not None and after is None
+        direction = "DESC" if desc != backwards else "ASC"
+        query += " ORDER BY " + ", ".join(f"{col} {direction}" for col in key_cols)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self.select_all(query + ";", tuple(params), record=record)
+        return rows[::-1] if backwards else rows
+
+
+    def select_columns(self, query: str, params: tuple = (), numpy: bool = False) -> dict:
+        """
+        Ejecuta un SELECT y retorna el resultado por columnas, para cálculos
+        analíticos sobre muchas filas (una lista por columna en lugar de una
+        tupla por fila).
+
+        Args:
+            numpy (bool): convierte cada columna en un numpy.ndarray.
+
+        Returns:
+            dict[str, list]: {nombre de columna: valores}; {} si hay un error.
+        """
+        if not self._connection:
+            return {}
+        try:
+            start = time.perf_counter()
+            with self._reader() as conn:
+                cur = self._cursor(conn)
+                cur.row_factory = None
+                cur.execute(query, params)
+                names = [d[0] for d in cur.description]
+                columns = [[] for _ in names]
+                count = 0
+                # Por lotes, para no tener a la vez todas las filas y todas las columnas
+                while rows := cur.fetchmany(self.COLUMN_BATCH):
+                    count += len(rows)
+                    for column, values in zip(columns, zip(*rows)):
+                        column.extend(values)
+            self._profile(query, params, time.perf_counter() - start, count)
+        except sqlite3.Error as e:
+            print("[ERROR] select_columns:", e)
+            return {}
+        if numpy:
+            import numpy as np
+            return {name: np.asarray(column) for name, column in zip(names, columns)}
+        return dict(zip(names, columns))
+
+
+    def _profile(self, query: str, params: tuple, elapsed: float, rows: int):
+        """
+        Registra la duración (s) de una sentencia en el profiler y, si es
+        lenta, su plan de ejecución. Fuera de transaction() se llama con la
+        conexión ya liberada.
+        """
+        if not self.profiler.enabled:
+            return
+        if self.profiler.record(query, elapsed, rows):
+            self.profiler.log_slow(query, params, elapsed, self.explain(query, params))
+
+
+    def _profile_block(self, label: str, elapsed: float):
+        """
+        Registra un bloque de varias sentencias (sin plan de ejecución).
+        """
+        if self.profiler.enabled and self.profiler.record(label, elapsed, 0):
+            self.profiler.log_slow(label, (), elapsed, [])
+
+
+    def explain(self, query: str, params: tuple = ()) -> list[str]:
+        """
+        Retorna el EXPLAIN QUERY PLAN de una sentencia, una línea por paso.
+        """
+        try:
+            with self._reader() as conn:
+                plan = conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+        except sqlite3.Error as e:
+            return [f"(sin plan: {e})"]
+        return [row[3] for row in plan]
+
+
+    def iter_rows(self, query: str, params: tuple = (), batch_size: int = 1000,
+                  record: type | None = None):
+        """
+        Ejecuta un SELECT y entrega las filas como tuplas (o como 'record') en
+        lotes con fetchmany, sin materializar el resultado completo.
+
+        La conexión de lectura queda ocupada hasta agotar o cerrar el generador
+        (sin pool, esto bloquea las escrituras de otros hilos mientras tanto).
+        En el profiler se registra el tiempo de SQLite (execute y fetchmany),
+        sin el que pasa el consumidor procesando las filas.
+
+        Yields:
+            tuple: cada fila del resultado.
+        """
+        if not self._connection:
+            return
+        elapsed, count = 0.0, 0
+        try:
+            with self._reader() as conn:
+                start = time.perf_counter()
+                cur = conn.cursor()
+                cur.row_factory = record and row_factory(record)
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    count += len(rows)
+                    yield from rows
+                    start = time.perf_counter()
+                cur.close()
+        except sqlite3.Error as e:
+            print("[ERROR] iter_rows:", e)
+        finally:
+            self._profile(query, params, elapsed, count)
+
+
+    def subscribe(self, callback):
+        """
+        Registra una función callback(table) que se llama tras cada cambio
+        confirmado notificado con notify_change.
+        """
+        self._listeners.append(callback)
+
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+
+    def notify_change(self, table: str):
+        """
+        Avisa a los suscriptores de que 'table' ha cambiado (p. ej. para
+        invalidar cachés). Se llama después del COMMIT.
+        """
+        for callback in list(self._listeners):
+            try:
+                callback(table)
+            except Exception as e:
+                print("[ERROR] notify_change:", e)
+
+
+    @staticmethod
+    def chunks(items: list, size: int = IN_CHUNK):
+        """
+        Divide una lista en lotes para consultas 'IN (...)' o executemany.
+
+        Yields:
+            tuple[list, str]: (lote, placeholders '?, ?, ...' del tamaño del lote).
+        """
+        for i in range(0, len(items), size):
+            batch = items[i:i + size]
+            yield batch, ", ".join("?" * len(batch))
+
+
+    @staticmethod
+    def prefix_range(prefix: str) -> tuple[str, str]:
+        """
+        Límites para buscar por prefijo con un índice: 'col >= lo AND col < hi'
+        (a diferencia de LIKE, que no usa índices con otra intercalación).
+
+        Returns:
+            tuple[str, str]: (lo, hi).
+        """
+        return prefix, prefix + "\U0010ffff"
+
+
+    def pragma_report(self) -> dict:
+        """
+        Retorna los valores efectivos de los PRAGMAs en la conexión de escritura.
+
+        Returns:
+            dict: {pragma: valor} para cada uno de PRAGMAS.
+        """
+        if not self._connection:
+            return {}
+        report = {}
+        with self._writer() as conn:
+            for name in self.PRAGMAS:
+                row = conn.execute(f"PRAGMA {name};").fetchone()
+                report[name] = row[0] if row else None
+        return report
+
+
     def _setup_tables(self):
         """
-        Crea las tablas 'users', 'books' y 'loans' si no existen.
-        """
-        self.update("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                email TEXT NOT NULL UNIQUE,
-                password TEXT NOT NULL,
-                deleted_at TEXT NULL
-            );
-        """)
-        self.update("""
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                isbn TEXT NOT NULL UNIQUE,
-                author TEXT NOT NULL,
-                category TEXT NOT NULL,
-                available INTEGER NOT NULL DEFAULT 1,
-                deleted_at TEXT NULL
-            );
-        """)
-        self.update("""
-            CREATE TABLE IF NOT EXISTS loans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_id INTEGER,
-                user_id INTEGER,
-                loan_date TEXT NOT NULL,
-                return_date TEXT NULL,
-                FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE SET NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
-            );
-        """)
+        Crea o actualiza el esquema aplicando las migraciones pendientes.
+        """
+        if not self._connection:
+            return
+        try:
+            with self._writer() as conn:
+                migrations.migrate(conn, self.profiler)
+        except sqlite3.Error as e:
+            print("[ERROR] Migración del esquema:", e)
+
+
+    def schema_version(self) -> int:
+        """
+        Retorna la versión del esquema (PRAGMA user_version).
+        """
+        row = self.select_one("PRAGMA user_version;")
+        return row[0] if row else 0
 
 
     def seed_data(self):
@@ -190,8 +616,18 @@ class Database:
 
     def close(self):
         """
-        Cierra la conexión a la base de datos.
+        Cierra la conexión a la base de datos y el pool de lectura.
+
+        Espera al lock de escritura, de modo que una sentencia o transacción
+        en curso en otro hilo termina antes de cerrar. Las conexiones de
+        lectura libres se cierran ahora y las que estén en uso, al devolverse.
         """
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        with self._write_lock:
+            pool, self._reader_pool = self._reader_pool, None
+            if pool is not None:
+                while not pool.empty():
+                    pool.get().close()
+            self._cursors.clear()
+            if self._connection:
+                self._connection.close()
+                self._connection = None
@@ -1,6 +1,9 @@
 # clases/loan.py
+import sqlite3
 from datetime import datetime
 from clases.database import Database
+from clases.records import LoanRecord
+from clases.statistics import Statistics
 
 class Loan:
     """
@@ -20,6 +23,11 @@ class Loan:
         """
         Registra un préstamo y actualiza la disponibilidad del libro a 0 (no disponible).
 
+        Las escrituras (libro, préstamo y tablas resumen de estadísticas) se
+        hacen en una sola transacción BEGIN IMMEDIATE; el
+        UPDATE condicional (available=1) impide que dos puestos presten a la
+        vez el mismo ejemplar.
+
         Args:
             user_id (int): ID del usuario que toma prestado el libro.
             book_id (int): ID del libro prestado.
@@ -27,90 +35,284 @@ class Loan:
         Returns:
             bool | str: True si el préstamo fue exitoso, mensaje de error (str) si falla.
         """
-        # Verificar disponibilidad real y existencia del libro
-        book = self.db.select_one("SELECT available FROM books WHERE id=? AND deleted_at IS NULL", (book_id,))
-        if not book:
-            return "El libro no existe o fue eliminado."
-        if book[0] == 0:
-            return "El libro no está disponible actualmente."
-
-        # Registrar préstamo
         loan_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if not self.db.insert("INSERT INTO loans (book_id, user_id, loan_date) VALUES (?, ?, ?)", 
-                            (book_id, user_id, loan_date)):
-            return "Error al registrar el préstamo en la base de datos."
+        try:
+            with self.db.transaction("Loan.lend_book") as cur:
+                # Reservar el libro solo si sigue disponible
+                cur.execute(
+                    "UPDATE books SET available=0 WHERE id=? AND available=1 AND deleted_at IS NULL",
+                    (book_id,)
+                )
+                if cur.rowcount == 0:
+                    cur.execute("SELECT 1 FROM books WHERE id=? AND deleted_at IS NULL", (book_id,))
+                    if not cur.fetchone():
+                        return "El libro no existe o fue eliminado."
+                    return "El libro no está disponible actualmente."
 
-        # Actualizar estado libro (available = 0)
-        self.db.update("UPDATE books SET available=0 WHERE id=?", (book_id,))
+                # Registrar préstamo
+                cur.execute(
+                    "INSERT INTO loans (book_id, user_id, loan_date) VALUES (?, ?, ?)",
+                    (book_id, user_id, loan_date)
+                )
+                Statistics.record_loans(cur, [(book_id, loan_date)])
+        except sqlite3.Error as e:
+            print("[ERROR] lend_book:", e)
+            return "Error al registrar el préstamo en la base de datos."
+        self.db.notify_change("loans")
         return True
 
 
     def return_book(self, loan_id: int, book_id: int) -> bool:
         """
         Registra la fecha de devolución en el préstamo y actualiza la disponibilidad
-        del libro a 1 (disponible).
+        del libro a 1 (disponible), en una sola transacción.
 
         Args:
             loan_id (int): ID del registro de préstamo activo.
             book_id (int): ID del libro a liberar.
 
         Returns:
-            bool: True si la devolución fue exitosa, False si falla.
+            bool: True si la devolución fue exitosa, False si el préstamo no
+                estaba activo o falla la base de datos.
         """
         ret_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Cerrar préstamo (solo si return_date es NULL)
-        ok_loan = self.db.update(
-            "UPDATE loans SET return_date=? WHERE id=? AND return_date IS NULL", 
-            (ret_date, loan_id)
-        )
-        
-        # Liberar libro (available = 1)
-        ok_book = self.db.update("UPDATE books SET available=1 WHERE id=?", (book_id,))
-        
-        # Debe ser exitoso si el préstamo existía y se pudo actualizar el libro.
-        return ok_loan and ok_book
+        try:
+            with self.db.transaction("Loan.return_book") as cur:
+                # Cerrar préstamo (solo si return_date es NULL)
+                cur.execute(
+                    "UPDATE loans SET return_date=? WHERE id=? AND book_id=? AND return_date IS NULL",
+                    (ret_date, loan_id, book_id)
+                )
+                if cur.rowcount == 0:
+                    return False
+
+                # Liberar libro (available = 1)
+                cur.execute("UPDATE books SET available=1 WHERE id=?", (book_id,))
+        except sqlite3.Error as e:
+            print("[ERROR] return_book:", e)
+            return False
+        self.db.notify_change("loans")
+        return True
+
+
+    def lend_many(self, pairs: list[tuple[int, int]]) -> list[tuple[tuple[int, int], bool | str]]:
+        """
+        Registra varios préstamos en una sola transacción.
+
+        La disponibilidad de libros y la existencia de usuarios se validan con
+        consultas por lotes dentro de la transacción, y las escrituras se hacen
+        con executemany.
+
+        Args:
+            pairs (list[tuple[int, int]]): lista de (user_id, book_id).
+
+        Returns:
+            list: (par, resultado) por cada elemento, en el orden recibido;
+                resultado es True o un mensaje de error (str).
+        """
+        report = [[pair, True] for pair in pairs]
+        if not pairs:
+            return []
+
+        loan_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.db.transaction("Loan.lend_many") as cur:
+                book_ids = list({b for _, b in pairs})
+                user_ids = list({u for u, _ in pairs})
+                books = {}
+                for batch, marks in self.db.chunks(book_ids):
+                    cur.execute(
+                        f"SELECT id, available FROM books WHERE deleted_at IS NULL AND id IN ({marks})",
+                        batch
+                    )
+                    books.update((r[0], r[1]) for r in cur.fetchall())
+                users = set()
+                for batch, marks in self.db.chunks(user_ids):
+                    cur.execute(
+                        f"SELECT id FROM users WHERE deleted_at IS NULL AND id IN ({marks})",
+                        batch
+                    )
+                    users.update(r[0] for r in cur.fetchall())
+
+                taken = set()
+                for item in report:
+                    user_id, book_id = item[0]
+                    if book_id not in books:
+                        item[1] = "El libro no existe o fue eliminado."
+                    elif user_id not in users:
+                        item[1] = "El usuario no existe o fue eliminado."
+                    elif books[book_id] == 0 or book_id in taken:
+                        item[1] = "El libro no está disponible actualmente."
+                    else:
+                        taken.add(book_id)
+
+                ok = [item[0] for item in report if item[1] is True]
+                cur.executemany("UPDATE books SET available=0 WHERE id=?", [(b,) for _, b in ok])
+                cur.executemany(
+                    "INSERT INTO loans (book_id, user_id, loan_date) VALUES (?, ?, ?)",
+                    [(b, u, loan_date) for u, b in ok]
+                )
+                Statistics.record_loans(cur, [(b, loan_date) for _, b in ok])
+        except sqlite3.Error as e:
+            print("[ERROR] lend_many:", e)
+            return [(pair, "Error al registrar el préstamo en la base de datos.") for pair in pairs]
+        if any(item[1] is True for item in report):
+            self.db.notify_change("loans")
+        return [tuple(item) for item in report]
+
+
+    def return_many(self, loan_ids: list[int]) -> list[tuple[int, bool]]:
+        """
+        Registra varias devoluciones en una sola transacción.
+
+        Args:
+            loan_ids (list[int]): IDs de préstamos a cerrar.
+
+        Returns:
+            list: (loan_id, True/False) por cada elemento, en el orden recibido;
+                False si el préstamo no existía o ya estaba cerrado.
+        """
+        if not loan_ids:
+            return []
 
+        ret_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.db.transaction("Loan.return_many") as cur:
+                active = {}
+                for batch, marks in self.db.chunks(list(set(loan_ids))):
+                    cur.execute(
+                        f"SELECT id, book_id FROM loans WHERE return_date IS NULL AND id IN ({marks})",
+                        batch
+                    )
+                    active.update((r[0], r[1]) for r in cur.fetchall())
+
+                cur.executemany(
+                    "UPDATE loans SET return_date=? WHERE id=?",
+                    [(ret_date, lid) for lid in active]
+                )
+                cur.executemany(
+                    "UPDATE books SET available=1 WHERE id=?",
+                    [(bid,) for bid in active.values()]
+                )
+        except sqlite3.Error as e:
+            print("[ERROR] return_many:", e)
+            return [(lid, False) for lid in loan_ids]
+
+        if active:
+            self.db.notify_change("loans")
+
+        # Un ID repetido solo se devuelve una vez
+        report = []
+        for lid in loan_ids:
+            report.append((lid, active.pop(lid, None) is not None))
+        return report
+
+
+    def get_active_by_books(self, book_ids: list[int]) -> dict[int, int]:
+        """
+        Obtener el préstamo activo de cada libro indicado.
 
-    def get_active_loans(self) -> list[tuple]:
+        Returns:
+            dict[int, int]: {book_id: loan_id} de los libros actualmente prestados.
+        """
+        found = {}
+        for batch, marks in self.db.chunks(list(set(book_ids))):
+            rows = self.db.select_all(
+                f"SELECT book_id, id FROM loans WHERE return_date IS NULL AND book_id IN ({marks});",
+                tuple(batch)
+            )
+            found.update(rows)
+        return found
+
+
+    def get_active_loans(self, after: tuple[str, int] | None = None,
+                         before: tuple[str, int] | None = None,
+                         limit: int | None = None) -> list[LoanRecord]:
         """
-        Obtener todos los préstamos activos (no devueltos).
+        Obtener los préstamos activos (no devueltos), del más antiguo al más reciente.
+
+        Admite paginación por clave (keyset) sobre (loan_date, id).
+
+        Args:
+            after (tuple | None): (loan_date, id) del último préstamo de la página actual.
+            before (tuple | None): (loan_date, id) del primer préstamo de la página actual.
+            limit (int | None): tamaño máximo de la página.
 
         Returns:
-            list: Lista de tuplas con (loan_id, title, username, loan_date, book_id).
+            list: Lista de LoanRecord (return_date siempre es None).
         """
+        # return_date es NULL por el filtro: se selecciona como literal para que
+        # la consulta siga cubierta por idx_loans_active_seek.
         query = """
-            SELECT l.id, b.title, u.username, l.loan_date, l.book_id
+            SELECT l.id, b.title, u.username, l.loan_date, NULL, l.book_id
             FROM loans l
             INNER JOIN books b ON l.book_id = b.id
             INNER JOIN users u ON l.user_id = u.id
             WHERE l.return_date IS NULL
-            ORDER BY l.loan_date ASC;
         """
-        return self.db.select_all(query)
+        return self.db.keyset(
+            query, key_cols=("l.loan_date", "l.id"),
+            after=after, before=before, limit=limit, record=LoanRecord
+        )
 
 
-    def get_history(self, user_id: int | None = None) -> list[tuple]:
+    def get_history(self, user_id: int | None = None, after: tuple[str, int] | None = None,
+                    before: tuple[str, int] | None = None, limit: int | None = None) -> list[LoanRecord]:
         """
-        Obtener el historial completo de préstamos (activos y devueltos), 
-        opcionalmente filtrado por usuario.
+        Obtener el historial de préstamos (activos y devueltos), del más reciente
+        al más antiguo, opcionalmente filtrado por usuario.
+
+        Admite paginación por clave (keyset) sobre (loan_date, id), en el orden
+        mostrado: 'after' devuelve los préstamos que siguen a la clave (más
+        antiguos, página siguiente) y 'before' los que la preceden (más
+        recientes, página anterior).
 
         Args:
             user_id (int | None): ID de usuario para filtrar, None para todos.
+            after (tuple | None): (loan_date, id) del último préstamo de la página actual.
+            before (tuple | None): (loan_date, id) del primer préstamo de la página actual.
+            limit (int | None): tamaño máximo de la página.
 
         Returns:
-            list: Lista de tuplas con (loan_id, title, username, loan_date, return_date).
+            list: Lista de LoanRecord (return_date es None si sigue activo).
         """
         query = """
-            SELECT l.id, b.title, u.username, l.loan_date, l.return_date
+            SELECT l.id, b.title, u.username, l.loan_date, l.return_date, l.book_id
             FROM loans l
             LEFT JOIN books b ON l.book_id = b.id
             LEFT JOIN users u ON l.user_id = u.id
+            WHERE 1=1
         """
         params = ()
         if user_id is not None:
-            query += " WHERE l.user_id=?"
+            query += " AND l.user_id=?"
             params = (user_id,)
-        
-        query += " ORDER BY l.loan_date DESC;"
-        return self.db.select_all(query, params)
\ No newline at end of file
+        return self.db.keyset(
+            query, params, key_cols=("l.loan_date", "l.id"),
+            after=after, before=before, limit=limit, desc=True, record=LoanRecord
+        )
+
+
+    def count_active(self) -> int:
+        """
+        Cuenta los préstamos activos (mismas condiciones que get_active_loans).
+        """
+        row = self.db.select_one("""
+            SELECT COUNT(*)
+            FROM loans l
+            INNER JOIN books b ON l.book_id = b.id
+            INNER JOIN users u ON l.user_id = u.id
+            WHERE l.return_date IS NULL;
+        """)
+        return row[0] if row else 0
+
+
+    def count_history(self, user_id: int | None = None) -> int:
+        """
+        Cuenta los préstamos del historial, opcionalmente filtrado por usuario.
+        """
+        if user_id is None:
+            row = self.db.select_one("SELECT COUNT(*) FROM loans;")
+        else:
+            row = self.db.select_one("SELECT COUNT(*) FROM loans WHERE user_id=?;", (user_id,))
+        return row[0] if row else 0
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+class LoginThrottle:
+    """
+    Limita los intentos fallidos de inicio de sesión por usuario y por origen
+    (p. ej. el puesto o la IP) con espera exponencial.
+
+    Tras FREE_FAILURES fallos seguidos, cada nuevo fallo bloquea la clave
+    durante base_delay * 2^n segundos (hasta max_delay). Mientras una clave
+    está bloqueada, User.authenticate la rechaza sin calcular bcrypt.
+
+    Se guardan como máximo MAX_ENTRIES claves, de modo que probar miles de
+    nombres distintos no hace crecer la memoria ni el coste de cada fallo.
+    Al superarlo se descarta la clave más antigua que no esté bloqueada ni
+    haya llegado a bloquearse (olvidarla no desbloquea a nadie). Si no hay
+    ninguna así, las claves nuevas comparten la entrada OVERFLOW_KEY: bajo
+    ese ataque, los usuarios sin entrada propia se bloquean juntos en lugar
+    de quedar sin límite.
+    """
+    FREE_FAILURES = 3
+    MAX_ENTRIES = 10000
+    MAX_DOUBLINGS = 30
+    EVICT_SCAN = 100      # entradas revisadas como máximo para descartar una
+    OVERFLOW_KEY = ("overflow", "*")
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 300.0, forget_after: float = 3600.0):
+        """
+        Args:
+            base_delay (float): segundos del primer bloqueo.
+            max_delay (float): bloqueo máximo en segundos.
+            forget_after (float): segundos sin fallos tras los que se olvida una clave.
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.forget_after = forget_after
+        # clave -> [fallos, bloqueado_hasta, último_fallo], de la más antigua a la más reciente
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    @staticmethod
+    def _keys(username: str, source: str | None) -> list[tuple[str, str]]:
+        keys = [("user", username.strip().lower())]
+        if source is not None:
+            keys.append(("source", source))
+        return keys
+
+
+    def retry_after(self, username: str, source: str | None = None) -> float:
+        """
+        Segundos que faltan para poder intentarlo de nuevo (0 si está permitido).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = [self._entries.get(k) for k in self._keys(username, source)]
+            if entries[0] is None:
+                entries.append(self._entries.get(self.OVERFLOW_KEY))
+            waits = [entry[1] - now for entry in entries if entry is not None]
+        return max([0.0] + waits)
+
+
+    def record_failure(self, username: str, source: str | None = None):
+        """
+        Registra un intento fallido y, si corresponde, bloquea las claves.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in self._keys(username, source):
+                entry = self._entries.get(key)
+                if entry is None and len(self._entries) >= self.MAX_ENTRIES and not self._evict(now):
+                    key = self.OVERFLOW_KEY
+                    entry = self._entries.get(key)
+                if entry is None or now - entry[2] > self.forget_after:
+                    entry = self._entries[key] = [0, 0.0, now]
+                self._entries.move_to_end(key)
+                entry[0] += 1
+                entry[2] = now
+                excess = entry[0] - self.FREE_FAILURES
+                if excess > 0:
+                    # Exponente acotado: sin límite, 2 ** n desborda el float tras ~1000 fallos
+                    doublings = min(excess - 1, self.MAX_DOUBLINGS)
+                    entry[1] = now + min(self.max_delay, self.base_delay * 2 ** doublings)
+
+
+    def _evict(self, now: float) -> bool:
+        """
+        Descarta la entrada más antigua que pueda olvidarse: sin bloqueo
+        vigente y, o bien por debajo de FREE_FAILURES, o bien sin fallos desde
+        hace forget_after. Las que se conservan pasan al final para que la
+        siguiente búsqueda revise otras.
+
+        Returns:
+            bool: True si se descartó alguna.
+        """
+        for _ in range(min(self.EVICT_SCAN, len(self._entries))):
+            key, (failures, locked_until, last) = next(iter(self._entries.items()))
+            if locked_until <= now and (failures < self.FREE_FAILURES or now - last > self.forget_after):
+                del self._entries[key]
+                return True
+            self._entries.move_to_end(key)
+        return False
+
+
+    def record_success(self, username: str):
+        """
+        Reinicia el contador del usuario. El del origen se mantiene, para que
+        acertar con una cuenta no desbloquee los intentos contra otras.
+        """
+        with self._lock:
+            self._entries.pop(self._keys(username, None)[0], None)
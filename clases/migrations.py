@@ -0,0 +1,211 @@
+import sqlite3
+import time
+
+# Migraciones del esquema, en orden. Cada entrada es (versión, [sentencias]).
+# La versión aplicada se guarda en PRAGMA user_version, de modo que un
+# 'library.db' existente se actualiza en el sitio al abrirlo.
+MIGRATIONS = [
+    (1, [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            email TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            deleted_at TEXT NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            isbn TEXT NOT NULL UNIQUE,
+            author TEXT NOT NULL,
+            category TEXT NOT NULL,
+            available INTEGER NOT NULL DEFAULT 1,
+            deleted_at TEXT NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS loans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER,
+            user_id INTEGER,
+            loan_date TEXT NOT NULL,
+            return_date TEXT NULL,
+            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE SET NULL,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+        );
+        """,
+    ]),
+    (2, [
+        # Préstamos activos ordenados por fecha (Loan.get_active_loans).
+        """
+        CREATE INDEX IF NOT EXISTS idx_loans_active_date
+        ON loans(loan_date, book_id, user_id) WHERE return_date IS NULL;
+        """,
+        # Préstamos activos por usuario (User.soft_delete).
+        """
+        CREATE INDEX IF NOT EXISTS idx_loans_active_user
+        ON loans(user_id) WHERE return_date IS NULL;
+        """,
+        # Historial completo ordenado por fecha (Loan.get_history).
+        """
+        CREATE INDEX IF NOT EXISTS idx_loans_loan_date
+        ON loans(loan_date);
+        """,
+        # Historial de un usuario ordenado por fecha (Loan.get_history(user_id)).
+        """
+        CREATE INDEX IF NOT EXISTS idx_loans_user_date
+        ON loans(user_id, loan_date);
+        """,
+        # Préstamos por libro (joins de estadísticas).
+        """
+        CREATE INDEX IF NOT EXISTS idx_loans_book
+        ON loans(book_id);
+        """,
+    ]),
+    (3, [
+        # Paginación por clave (loan_date, id) de los préstamos activos.
+        "DROP INDEX IF EXISTS idx_loans_active_date;",
+        """
+        CREATE INDEX IF NOT EXISTS idx_loans_active_seek
+        ON loans(loan_date, id, book_id, user_id) WHERE return_date IS NULL;
+        """,
+    ]),
+    (4, [
+        # Contadores de préstamos mantenidos por Loan (ver Statistics.record_loans).
+        """
+        CREATE TABLE IF NOT EXISTS stats_book_loans (
+            book_id INTEGER PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_author_loans (
+            author TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_category_loans (
+            category TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_month_loans (
+            month TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stats_book_total ON stats_book_loans(total);",
+        "CREATE INDEX IF NOT EXISTS idx_stats_author_total ON stats_author_loans(total, author);",
+        # Carga inicial a partir de los préstamos existentes.
+        """
+        INSERT INTO stats_book_loans (book_id, total)
+        SELECT book_id, COUNT(*) FROM loans WHERE book_id IS NOT NULL GROUP BY book_id;
+        """,
+        """
+        INSERT INTO stats_author_loans (author, total)
+        SELECT b.author, COUNT(*) FROM loans l INNER JOIN books b ON l.book_id = b.id GROUP BY b.author;
+        """,
+        """
+        INSERT INTO stats_category_loans (category, total)
+        SELECT b.category, COUNT(*) FROM loans l INNER JOIN books b ON l.book_id = b.id GROUP BY b.category;
+        """,
+        """
+        INSERT INTO stats_month_loans (month, total)
+        SELECT substr(loan_date, 1, 7), COUNT(*) FROM loans GROUP BY substr(loan_date, 1, 7);
+        """,
+    ]),
+    (5, [
+        # Índice de texto completo de libros (ver Book.search). Es una tabla de
+        # contenido externo: guarda solo el índice y lee el texto de 'books'.
+        # Sin mayúsculas ni acentos, con índices de prefijo de 2 y 3 letras.
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            title, author, category,
+            content='books', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+        """,
+        # Sincronización con 'books'. El UPDATE solo se dispara al cambiar los
+        # campos indexados (no al prestar/devolver, que cambia 'available').
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, title, author, category)
+            VALUES (new.id, new.title, new.author, new.category);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author, category)
+            VALUES ('delete', old.id, old.title, old.author, old.category);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author, category ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author, category)
+            VALUES ('delete', old.id, old.title, old.author, old.category);
+            INSERT INTO books_fts (rowid, title, author, category)
+            VALUES (new.id, new.title, new.author, new.category);
+        END;
+        """,
+        # Carga inicial con los libros existentes.
+        "INSERT INTO books_fts (books_fts) VALUES ('rebuild');",
+    ]),
+    (6, [
+        # Búsqueda por prefijo sin distinguir mayúsculas (selectores de LoanForm).
+        """
+        CREATE INDEX IF NOT EXISTS idx_users_username_nocase
+        ON users(username COLLATE NOCASE) WHERE deleted_at IS NULL;
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_books_title_nocase
+        ON books(title COLLATE NOCASE) WHERE deleted_at IS NULL;
+        """,
+    ]),
+]
+
+# Última versión del esquema conocida por la aplicación.
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """
+    Retorna la versión del esquema guardada en PRAGMA user_version.
+    """
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, profiler=None) -> int:
+    """
+    Aplica las migraciones pendientes, cada una en su propia transacción.
+
+    Args:
+        conn (sqlite3.Connection): conexión de escritura.
+        profiler (QueryProfiler | None): registra la duración de cada sentencia.
+
+    Returns:
+        int: versión del esquema tras migrar.
+    """
+    current = get_version(conn)
+    for version, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for sql in statements:
+                start = time.perf_counter()
+                conn.execute(sql)
+                if profiler is not None and profiler.enabled:
+                    profiler.record(sql, time.perf_counter() - start, 0)
+            conn.execute(f"PRAGMA user_version={version};")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        current = version
+    return current
@@ -0,0 +1,173 @@
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+class QueryProfiler:
+    """
+    Estadísticas de las sentencias SQL ejecutadas por Database.
+
+    Agrupa las sentencias por su forma normalizada (sin literales y con las
+    listas 'IN (?, ?, ...)' colapsadas) y guarda por cada una el número de
+    ejecuciones, el tiempo total y máximo, las filas y un histograma de
+    latencias. Las que superan 'slow_ms' se guardan en un registro de
+    consultas lentas junto con su EXPLAIN QUERY PLAN.
+    """
+    # Límites superiores (ms) de los tramos del histograma; el último es abierto.
+    BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+    SLOW_LOG_SIZE = 100
+
+    def __init__(self, slow_ms: float = 100.0, enabled: bool = True):
+        """
+        Args:
+            slow_ms (float): a partir de cuántos ms una sentencia es lenta.
+            enabled (bool): si se registran estadísticas.
+        """
+        self.slow_ms = slow_ms
+        self.enabled = enabled
+        self._stats = {}      # sql normalizado -> dict de contadores
+        self._slow = deque(maxlen=self.SLOW_LOG_SIZE)
+        self._lock = threading.Lock()
+
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def normalize(sql: str) -> str:
+        """
+        Forma normalizada de una sentencia para agruparla con sus variantes.
+        """
+        sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+        sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+        sql = " ".join(sql.split())
+        return re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, …)", sql)
+
+
+    def record(self, sql: str, seconds: float, rows: int) -> bool:
+        """
+        Registra una ejecución.
+
+        Returns:
+            bool: True si la sentencia superó el umbral de consulta lenta.
+        """
+        ms = seconds * 1000
+        key = self.normalize(sql)
+        bucket = next((i for i, limit in enumerate(self.BUCKETS_MS) if ms <= limit), len(self.BUCKETS_MS))
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                    "histogram": [0] * (len(self.BUCKETS_MS) + 1),
+                }
+            entry["count"] += 1
+            entry["total_ms"] += ms
+            entry["rows"] += rows
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            entry["histogram"][bucket] += 1
+        return ms >= self.slow_ms
+
+
+    def log_slow(self, sql: str, params: tuple, seconds: float, plan: list[str]):
+        """
+        Añade una consulta lenta al registro y la muestra por consola.
+        """
+        ms = seconds * 1000
+        with self._lock:
+            self._slow.append({
+                "time": time.strftime("%H:%M:%S"),
+                "sql": " ".join(sql.split()),
+                "params": params,
+                "ms": ms,
+                "plan": plan,
+            })
+        print(f"[LENTA] {ms:.1f} ms: {self.normalize(sql)}")
+        for line in plan:
+            print("        ", line)
+
+
+    def percentile(self, histogram: list[int], fraction: float) -> float:
+        """
+        Aproximación de un percentil: límite superior del tramo que lo contiene
+        (infinito para el tramo abierto).
+        """
+        target = sum(histogram) * fraction
+        seen = 0
+        for i, n in enumerate(histogram):
+            seen += n
+            if n and seen >= target:
+                return self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else float("inf")
+        return 0.0
+
+
+    def top(self, limit: int = 20, by: str = "total_ms") -> list[dict]:
+        """
+        Sentencias ordenadas por 'by' (total_ms, max_ms, count o rows).
+
+        Returns:
+            list[dict]: sql, count, total_ms, avg_ms, p95_ms, max_ms, rows y histogram.
+        """
+        with self._lock:
+            items = [(sql, dict(e, histogram=list(e["histogram"]))) for sql, e in self._stats.items()]
+        report = [
+            dict(
+                e,
+                sql=sql,
+                avg_ms=e["total_ms"] / e["count"],
+                p95_ms=self.percentile(e["histogram"], 0.95),
+            )
+            for sql, e in items
+        ]
+        report.sort(key=lambda e: e[by], reverse=True)
+        return report[:limit]
+
+
+    def slow_queries(self) -> list[dict]:
+        """
+        Consultas lentas registradas, de la más reciente a la más antigua.
+        """
+        with self._lock:
+            return list(reversed(self._slow))
+
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+
+class ProfiledCursor:
+    """
+    Envoltorio de un sqlite3.Cursor que mide cada execute/executemany y lo
+    pasa a 'on_statement(query, params, seconds, rows)'. El resto de
+    atributos (fetchone, rowcount, lastrowid...) son los del cursor.
+    """
+    __slots__ = ("_cursor", "_on_statement")
+
+    def __init__(self, cursor, on_statement):
+        self._cursor = cursor
+        self._on_statement = on_statement
+
+
+    def execute(self, query: str, params=()):
+        start = time.perf_counter()
+        self._cursor.execute(query, params)
+        self._on_statement(query, params, time.perf_counter() - start, max(self._cursor.rowcount, 0))
+        return self
+
+
+    def executemany(self, query: str, seq_of_params):
+        # Si es una lista, el primer juego de parámetros sirve para el EXPLAIN
+        params = seq_of_params[0] if isinstance(seq_of_params, list) and seq_of_params else ()
+        start = time.perf_counter()
+        self._cursor.executemany(query, seq_of_params)
+        self._on_statement(query, params, time.perf_counter() - start, max(self._cursor.rowcount, 0))
+        return self
+
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,53 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+class BookRecord(NamedTuple):
+    """
+    Libro tal como lo devuelven Book.get_by_id, list, search y search_prefix.
+    """
+    id: int
+    title: str
+    isbn: str
+    author: str
+    category: str
+    available: int
+
+
+class UserRecord(NamedTuple):
+    """
+    Usuario tal como lo devuelven User.get_by_id, list y search_prefix
+    (sin la contraseña).
+    """
+    id: int
+    username: str
+    email: str
+
+
+class LoanRecord(NamedTuple):
+    """
+    Préstamo con el título del libro y el nombre del usuario, tal como lo
+    devuelven Loan.get_active_loans y Loan.get_history. 'return_date' es
+    None mientras el préstamo está activo; 'title' y 'username' pueden ser
+    None en el historial si el libro o el usuario ya no existen.
+    """
+    id: int
+    title: str | None
+    username: str | None
+    loan_date: str
+    return_date: str | None
+    book_id: int
+
+
+@lru_cache(maxsize=None)
+def row_factory(record: type):
+    """
+    row_factory de sqlite3 que construye 'record' directamente con la fila.
+
+    Las tuplas con nombre son inmutables y con __slots__ vacíos: ocupan lo
+    mismo que una tupla simple y admiten tanto índices como atributos.
+    """
+    new = tuple.__new__
+
+    def factory(cursor, row):
+        return new(record, row)
+    return factory
@@ -0,0 +1,65 @@
+import secrets
+import threading
+import time
+
+class SessionCache:
+    """
+    Sesiones en memoria de usuarios ya autenticados.
+
+    User.login entrega un token aleatorio; mientras no caduque (TTL),
+    User.verify_session lo resuelve al ID del usuario sin volver a
+    comprobar la contraseña con bcrypt.
+    """
+    def __init__(self, ttl: float = 900.0):
+        """
+        Args:
+            ttl (float): segundos de validez de cada token.
+        """
+        self.ttl = ttl
+        self._sessions = {}   # token -> (caducidad, user_id)
+        self._lock = threading.Lock()
+
+
+    def create(self, user_id: int) -> str:
+        """
+        Abre una sesión para 'user_id' y retorna su token.
+        """
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            # Se aprovecha para descartar las sesiones caducadas
+            for key in [k for k, (expires, _) in self._sessions.items() if expires <= now]:
+                del self._sessions[key]
+            self._sessions[token] = (now + self.ttl, user_id)
+        return token
+
+
+    def validate(self, token: str) -> int | None:
+        """
+        Retorna el ID del usuario de una sesión vigente, o None.
+        """
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._sessions[token]
+                return None
+            return entry[1]
+
+
+    def revoke(self, token: str):
+        """
+        Cierra una sesión.
+        """
+        with self._lock:
+            self._sessions.pop(token, None)
+
+
+    def revoke_user(self, user_id: int):
+        """
+        Cierra todas las sesiones de un usuario (p. ej. al darlo de baja).
+        """
+        with self._lock:
+            for key in [k for k, (_, uid) in self._sessions.items() if uid == user_id]:
+                del self._sessions[key]
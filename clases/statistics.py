@@ -0,0 +1,256 @@
+import sqlite3
+from datetime import date
+from clases.database import Database
+from clases.stats_cache import StatsCache
+
+class Statistics:
+    """
+    Consultas de estadísticas agregadas directamente en SQLite.
+
+    Cada método devuelve solo las filas que necesita su gráfica, de modo que
+    la memoria usada depende del tamaño del resultado y no del número de préstamos.
+    Los totales por libro, autor, categoría y mes se leen de tablas resumen
+    (stats_*_loans) que Loan actualiza en la misma transacción que el préstamo.
+
+    Los resultados se guardan en un StatsCache que se invalida con cada cambio
+    notificado por Loan y Book (Database.notify_change).
+    """
+    # Tabla resumen -> (columna clave, consulta que la recalcula desde 'loans')
+    SUMMARIES = {
+        "stats_book_loans": ("book_id", """
+            SELECT book_id, COUNT(*) FROM loans WHERE book_id IS NOT NULL GROUP BY book_id
+        """),
+        "stats_author_loans": ("author", """
+            SELECT b.author, COUNT(*) FROM loans l INNER JOIN books b ON l.book_id = b.id GROUP BY b.author
+        """),
+        "stats_category_loans": ("category", """
+            SELECT b.category, COUNT(*) FROM loans l INNER JOIN books b ON l.book_id = b.id GROUP BY b.category
+        """),
+        "stats_month_loans": ("month", """
+            SELECT substr(loan_date, 1, 7), COUNT(*) FROM loans GROUP BY substr(loan_date, 1, 7)
+        """),
+    }
+
+    # Consulta -> tablas cuyos cambios alteran su resultado
+    DEPENDS = {
+        "top_books": ("loans", "books"),
+        "top_authors": ("loans", "books"),
+        "loans_by_category": ("loans", "books"),
+        "loans_per_month": ("loans",),
+        "recent_loans": ("loans", "books"),
+    }
+
+    def __init__(self, db: Database, cache: StatsCache | None = None):
+        """
+        Args:
+            db (Database): Instancia de base de datos.
+            cache (StatsCache | None): caché a usar; por defecto una nueva.
+        """
+        self.db = db
+        self.cache = cache or StatsCache()
+        self.db.subscribe(self.cache.invalidate)
+
+
+    def close(self):
+        """
+        Deja de escuchar los cambios de la base de datos. Debe llamarse al
+        descartar la instancia; si no, 'db' la mantiene viva con su caché.
+        """
+        self.db.unsubscribe(self.cache.invalidate)
+
+
+    @staticmethod
+    def record_loans(cur: sqlite3.Cursor, loans: list[tuple[int, str]]):
+        """
+        Suma los préstamos nuevos a las tablas resumen. Debe llamarse dentro de
+        la transacción que inserta los préstamos.
+
+        Args:
+            cur (sqlite3.Cursor): cursor de la transacción en curso.
+            loans (list): tuplas (book_id, loan_date) de los préstamos insertados.
+        """
+        by_book = [(book_id,) for book_id, _ in loans]
+        cur.executemany("""
+            INSERT INTO stats_book_loans (book_id, total) VALUES (?, 1)
+            ON CONFLICT(book_id) DO UPDATE SET total = total + 1
+        """, by_book)
+        cur.executemany("""
+            INSERT INTO stats_author_loans (author, total)
+            SELECT author, 1 FROM books WHERE id = ?
+            ON CONFLICT(author) DO UPDATE SET total = total + 1
+        """, by_book)
+        cur.executemany("""
+            INSERT INTO stats_category_loans (category, total)
+            SELECT category, 1 FROM books WHERE id = ?
+            ON CONFLICT(category) DO UPDATE SET total = total + 1
+        """, by_book)
+        cur.executemany("""
+            INSERT INTO stats_month_loans (month, total) VALUES (substr(?, 1, 7), 1)
+            ON CONFLICT(month) DO UPDATE SET total = total + 1
+        """, [(loan_date,) for _, loan_date in loans])
+
+
+    @staticmethod
+    def move_book(cur: sqlite3.Cursor, book_id: int, old: tuple[str, str], new: tuple[str, str]):
+        """
+        Traslada los préstamos de un libro entre autores/categorías cuando estos
+        cambian. Debe llamarse dentro de la transacción que actualiza el libro.
+
+        Args:
+            cur (sqlite3.Cursor): cursor de la transacción en curso.
+            book_id (int): ID del libro.
+            old (tuple): (author, category) anteriores.
+            new (tuple): (author, category) nuevos.
+        """
+        row = cur.execute("SELECT total FROM stats_book_loans WHERE book_id = ?", (book_id,)).fetchone()
+        total = row[0] if row else 0
+        if not total:
+            return
+        for table, column, before, after in (
+            ("stats_author_loans", "author", old[0], new[0]),
+            ("stats_category_loans", "category", old[1], new[1]),
+        ):
+            if before == after:
+                continue
+            cur.execute(f"UPDATE {table} SET total = total - ? WHERE {column} = ?", (total, before))
+            cur.execute(f"DELETE FROM {table} WHERE {column} = ? AND total <= 0", (before,))
+            cur.execute(f"""
+                INSERT INTO {table} ({column}, total) VALUES (?, ?)
+                ON CONFLICT({column}) DO UPDATE SET total = total + excluded.total
+            """, (after, total))
+
+
+    def rebuild_stats(self) -> bool:
+        """
+        Recalcula desde cero todas las tablas resumen a partir de 'loans'.
+
+        Returns:
+            bool: True si se reconstruyeron, False si falla la base de datos.
+        """
+        try:
+            with self.db.transaction("Statistics.rebuild_stats") as cur:
+                for table, (column, query) in self.SUMMARIES.items():
+                    cur.execute(f"DELETE FROM {table}")
+                    cur.execute(f"INSERT INTO {table} ({column}, total) {query}")
+        except sqlite3.Error as e:
+            print("[ERROR] rebuild_stats:", e)
+            return False
+        # Se notifica como cambio en 'loans' para invalidar también las cachés
+        # de otras instancias (p. ej. la del panel en vivo)
+        self.db.notify_change("loans")
+        return True
+
+
+    def check_consistency(self) -> dict[str, int]:
+        """
+        Compara cada tabla resumen con el recálculo desde 'loans'.
+
+        Returns:
+            dict[str, int]: {tabla: número de claves con total distinto};
+                todo a 0 si las tablas son consistentes.
+        """
+        report = {}
+        for table, (column, query) in self.SUMMARIES.items():
+            # Una clave con total distinto aparece en ambas diferencias: se cuenta una vez
+            row = self.db.select_one(f"""
+                WITH diff(key, total) AS (
+                    SELECT * FROM (SELECT {column}, total FROM {table} EXCEPT {query})
+                    UNION ALL
+                    SELECT * FROM ({query} EXCEPT SELECT {column}, total FROM {table})
+                )
+                SELECT COUNT(DISTINCT key) FROM diff;
+            """)
+            report[table] = row[0] if row else 0
+        return report
+
+
+    def top_books(self, limit: int = 10) -> list[tuple]:
+        """
+        Libros con más préstamos.
+
+        Returns:
+            list: Lista de tuplas (title, cantidad), de mayor a menor.
+        """
+        return self.cache.get_or_compute(("top_books", limit), self.DEPENDS["top_books"], lambda: self.db.select_all("""
+            SELECT b.title, s.total
+            FROM stats_book_loans s
+            INNER JOIN books b ON s.book_id = b.id
+            ORDER BY s.total DESC, s.book_id DESC
+            LIMIT ?;
+        """, (limit,)))
+
+
+    def top_authors(self, limit: int = 10) -> list[tuple]:
+        """
+        Autores con más préstamos.
+
+        Returns:
+            list: Lista de tuplas (author, cantidad), de mayor a menor.
+        """
+        return self.cache.get_or_compute(("top_authors", limit), self.DEPENDS["top_authors"], lambda: self.db.select_all("""
+            SELECT author, total
+            FROM stats_author_loans
+            ORDER BY total DESC, author DESC
+            LIMIT ?;
+        """, (limit,)))
+
+
+    def loans_by_category(self) -> list[tuple]:
+        """
+        Préstamos por categoría.
+
+        Returns:
+            list: Lista de tuplas (category, cantidad), de mayor a menor.
+        """
+        return self.cache.get_or_compute(("loans_by_category",), self.DEPENDS["loans_by_category"], lambda: self.db.select_all("""
+            SELECT category, total
+            FROM stats_category_loans
+            ORDER BY total DESC, category ASC;
+        """))
+
+
+    def loans_per_month(self, months: int = 6) -> list[tuple]:
+        """
+        Préstamos por mes en los últimos 'months' meses (incluido el actual).
+
+        Returns:
+            list: Lista de tuplas ('YYYY-MM', cantidad) en orden cronológico,
+                con 0 en los meses sin préstamos.
+        """
+        keys = self.month_keys(months)
+
+        def compute():
+            rows = self.db.select_all(
+                "SELECT month, total FROM stats_month_loans WHERE month BETWEEN ? AND ?;",
+                (keys[0], keys[-1])
+            )
+            counts = dict(rows)
+            return [(k, counts.get(k, 0)) for k in keys]
+
+        return self.cache.get_or_compute(("loans_per_month", months, keys[-1]), self.DEPENDS["loans_per_month"], compute)
+
+
+    def recent_loans(self, limit: int = 10) -> list[tuple]:
+        """
+        Últimos préstamos registrados.
+
+        Returns:
+            list: Lista de tuplas (title, loan_date), del más reciente al más antiguo.
+        """
+        return self.cache.get_or_compute(("recent_loans", limit), self.DEPENDS["recent_loans"], lambda: self.db.select_all("""
+            SELECT b.title, l.loan_date
+            FROM loans l
+            INNER JOIN books b ON l.book_id = b.id
+            ORDER BY l.loan_date DESC, l.id DESC
+            LIMIT ?;
+        """, (limit,)))
+
+
+    @staticmethod
+    def month_keys(months: int, today: date | None = None) -> list[str]:
+        """
+        Claves 'YYYY-MM' de los últimos 'months' meses, en orden cronológico.
+        """
+        today = today or date.today()
+        index = today.year * 12 + today.month - 1
+        return [f"{i // 12:04d}-{i % 12 + 1:02d}" for i in range(index - months + 1, index + 1)]
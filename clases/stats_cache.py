@@ -0,0 +1,84 @@
+import threading
+import time
+
+class StatsCache:
+    """
+    Caché en memoria de resultados de estadísticas, con caducidad (TTL) e
+    invalidación explícita por tabla.
+
+    Cada entrada se guarda con las tablas de las que depende; al modificarse
+    una de ellas (Database.notify_change) se descartan esas entradas. El TTL
+    cubre los cambios hechos por otros procesos sobre el mismo archivo.
+    """
+    def __init__(self, ttl: float = 30.0):
+        """
+        Args:
+            ttl (float): segundos que una entrada se considera válida.
+        """
+        self.ttl = ttl
+        self._entries = {}      # clave -> (caducidad, tablas, valor)
+        self._lock = threading.Lock()
+        self._generation = 0    # se incrementa en cada invalidación
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+
+    def get_or_compute(self, key: tuple, tables: tuple[str, ...], compute):
+        """
+        Retorna el valor en caché para 'key' o lo calcula y lo guarda.
+
+        Args:
+            key (tuple): tipo de gráfica y parámetros.
+            tables (tuple): tablas de las que depende el resultado.
+            compute: función sin argumentos que calcula el valor.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            # Si hubo una invalidación mientras se calculaba, el valor puede
+            # estar obsoleto: se devuelve pero no se guarda.
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, tables, value)
+        return value
+
+
+    def invalidate(self, table: str | None = None):
+        """
+        Descarta las entradas que dependen de 'table', o todas si es None.
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if table is None:
+                self._entries.clear()
+                return
+            for key in [k for k, (_, tables, _) in self._entries.items() if table in tables]:
+                del self._entries[key]
+
+
+    def stats(self) -> dict:
+        """
+        Contadores de uso para ajustar el TTL.
+
+        Returns:
+            dict: hits, misses, hit_rate, invalidations y entries.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
@@ -1,29 +1,112 @@
+import csv
+import os
 import re
+import sqlite3
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from clases.database import Database
+from clases.records import UserRecord
+from clases.login_throttle import LoginThrottle
+from clases.session_cache import SessionCache
 
 class User:
     """
     Gestión de usuarios, incluyendo autenticación.
+
+    El coste de bcrypt (rondas) se configura por instalación con la variable
+    de entorno LIBRARY_BCRYPT_ROUNDS o con el argumento 'rounds'. Al iniciar
+    sesión, las contraseñas guardadas con otro coste se vuelven a hashear.
+
+    Los intentos fallidos se limitan con un LoginThrottle y los inicios de
+    sesión correctos abren una sesión en un SessionCache. Por defecto se usan
+    los de la Database (db.login_throttle y db.sessions), de modo que todas
+    las instancias de User sobre la misma base de datos los comparten.
     """
-    def __init__(self, db: Database):
+    # Usuarios por lote de hashing e inserción en import_many().
+    IMPORT_BATCH = 200
+
+    # Coste de bcrypt por defecto (el de bcrypt.gensalt()) y límites válidos.
+    DEFAULT_ROUNDS = 12
+    MIN_ROUNDS = 4
+    MAX_ROUNDS = 31
+    ROUNDS_ENV = "LIBRARY_BCRYPT_ROUNDS"
+
+    def __init__(self, db: Database, rounds: int | None = None,
+                 throttle: LoginThrottle | None = None, sessions: SessionCache | None = None):
+        """
+        Args:
+            db (Database): Instancia de base de datos.
+            rounds (int | None): coste de bcrypt; por defecto el de
+                LIBRARY_BCRYPT_ROUNDS o DEFAULT_ROUNDS.
+            throttle (LoginThrottle | None): límite de intentos; por defecto db.login_throttle.
+            sessions (SessionCache | None): sesiones abiertas; por defecto db.sessions.
+
+        Raises:
+            ValueError: si el coste no es un entero entre MIN_ROUNDS y MAX_ROUNDS.
+        """
         self.db = db
+        self.rounds = self._resolve_rounds(rounds)
+        self.throttle = throttle or db.login_throttle
+        self.sessions = sessions or db.sessions
+
+
+    @classmethod
+    def _resolve_rounds(cls, rounds: int | None) -> int:
+        if rounds is None:
+            rounds = os.environ.get(cls.ROUNDS_ENV, cls.DEFAULT_ROUNDS)
+        try:
+            rounds = int(rounds)
+        except ValueError:
+            raise ValueError(f"Coste de bcrypt no válido: {rounds!r}") from None
+        if not cls.MIN_ROUNDS <= rounds <= cls.MAX_ROUNDS:
+            raise ValueError(f"El coste de bcrypt debe estar entre {cls.MIN_ROUNDS} y {cls.MAX_ROUNDS}.")
+        return rounds
 
 
-    def get_by_id(self, user_id: int) -> tuple | None:
+    @staticmethod
+    def hash_rounds(hashed: str) -> int | None:
+        """
+        Coste con el que se generó un hash bcrypt ('$2b$12$...'), o None si
+        el valor no tiene ese formato.
+        """
+        parts = hashed.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+
+    def get_by_id(self, user_id: int) -> UserRecord | None:
         """
         Obtener un usuario activo por ID.
 
         Returns:
-            tuple | None: (id, username, email) o None.
+            UserRecord | None: (id, username, email) o None.
         """
         return self.db.select_one(
             "SELECT id, username, email FROM users WHERE id=? AND deleted_at IS NULL;",
-            (user_id,)
+            (user_id,), record=UserRecord
         )
 
 
+    def search_prefix(self, prefix: str, limit: int = 20) -> list[UserRecord]:
+        """
+        Usuarios activos cuyo nombre empieza por 'prefix' (sin distinguir
+        mayúsculas), con el índice idx_users_username_nocase.
+
+        Returns:
+            list: Lista de UserRecord, en orden alfabético.
+        """
+        lo, hi = self.db.prefix_range(prefix.strip())
+        return self.db.select_all("""
+            SELECT id, username, email FROM users
+            WHERE deleted_at IS NULL
+              AND username COLLATE NOCASE >= ? AND username COLLATE NOCASE < ?
+            ORDER BY username COLLATE NOCASE
+            LIMIT ?;
+        """, (lo, hi, limit), record=UserRecord)
+
+
     @staticmethod
     def validate(username: str, password: str, email: str | None = None) -> dict:
         """
@@ -95,7 +178,7 @@ class User:
             return errors
 
         # Hashing de la contraseña.
-        hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        hashed = self._hash_password(password)
         
         result = self.db.insert(
             "INSERT INTO users (username, email, password) VALUES (?, ?, ?);",
@@ -104,36 +187,216 @@ class User:
         return result is not None
 
 
-    def list(self) -> list[tuple]:
+    def _hash_password(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)).decode("utf-8")
+
+
+    def _existing_values(self, column: str, values: list[str]) -> set[str]:
+        """
+        Valores de 'column' (username o email) que ya existen en 'users',
+        con consultas por lotes. Incluye usuarios borrados, que el índice
+        UNIQUE también tiene en cuenta.
+        """
+        found = set()
+        for batch, marks in self.db.chunks(values):
+            rows = self.db.select_all(f"SELECT {column} FROM users WHERE {column} IN ({marks});", tuple(batch))
+            found.update(r[0] for r in rows)
+        return found
+
+
+    def import_many(self, rows: list[tuple[str, str, str]], batch_size: int = IMPORT_BATCH,
+                    workers: int | None = None, progress=None) -> list[tuple[str, bool | str]]:
+        """
+        Crea muchos usuarios de una vez (p. ej. el listado de un centro).
+
+        Valida todas las filas, comprueba la unicidad de username y email con
+        consultas por lotes, calcula los hashes bcrypt en paralelo en un pool
+        de hilos (bcrypt libera el GIL) e inserta cada lote con executemany en
+        una transacción.
+
+        Args:
+            rows (list): tuplas (username, email, password).
+            batch_size (int): usuarios por lote de hashing e inserción.
+            workers (int | None): hilos de hashing; por defecto, uno por CPU.
+            progress: función opcional progress(procesados, total), llamada
+                desde el hilo que ejecuta la importación.
+
+        Returns:
+            list: Una tupla (username, True | mensaje de error) por fila, en orden.
+        """
+        rows = [(u.strip(), e.strip(), p) for u, e, p in rows]
+        results = [None] * len(rows)
+        taken_users = self._existing_values("username", [u for u, _, _ in rows])
+        taken_emails = self._existing_values("email", [e for _, e, _ in rows])
+
+        pending = []   # índices de las filas válidas
+        for i, (username, email, password) in enumerate(rows):
+            errors = self.validate(username, password, email)
+            if username in taken_users:
+                errors['username'] = "Este nombre de usuario ya está registrado."
+            if email in taken_emails:
+                errors['email'] = "Este email ya está registrado."
+            if errors:
+                results[i] = (username, "; ".join(f"{k}: {v}" for k, v in errors.items()))
+                continue
+            # Los repetidos dentro de la propia lista cuentan como registrados
+            taken_users.add(username)
+            taken_emails.add(email)
+            pending.append(i)
+
+        done = len(rows) - len(pending)
+        if progress:
+            progress(done, len(rows))
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                hashes = list(pool.map(self._hash_password, (rows[i][2] for i in batch)))
+                try:
+                    with self.db.transaction("User.import_many") as cur:
+                        cur.executemany(
+                            "INSERT INTO users (username, email, password) VALUES (?, ?, ?);",
+                            [(rows[i][0], rows[i][1], h) for i, h in zip(batch, hashes)]
+                        )
+                    outcome = True
+                except sqlite3.Error as e:
+                    print("[ERROR] import_many:", e)
+                    outcome = "Fallo al insertar el lote en la base de datos."
+                for i in batch:
+                    results[i] = (rows[i][0], outcome)
+                done += len(batch)
+                if progress:
+                    progress(done, len(rows))
+
+        if any(ok is True for _, ok in results):
+            self.db.notify_change("users")
+        return results
+
+
+    @staticmethod
+    def read_csv(path: str) -> list[tuple[str, str, str]]:
+        """
+        Lee un CSV con cabecera username,email,password.
+
+        Raises:
+            ValueError: si faltan columnas obligatorias.
+            OSError: si no se puede leer el archivo.
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            missing = [c for c in ("username", "email", "password") if c not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+            return [(r["username"] or "", r["email"] or "", r["password"] or "") for r in reader]
+
+
+    def list(self, after_id: int | None = None, before_id: int | None = None,
+             limit: int | None = None) -> list[UserRecord]:
         """
-        Lista todos los usuarios activos.
+        Lista los usuarios activos, ordenados por ID.
+
+        Admite paginación por clave (keyset): 'after_id' devuelve la página
+        siguiente a ese ID y 'before_id' la anterior.
+
+        Args:
+            after_id (int | None): ID del último usuario de la página actual.
+            before_id (int | None): ID del primer usuario de la página actual.
+            limit (int | None): tamaño máximo de la página.
 
         Returns:
-            list: Lista de tuplas con (id, username, email).
+            list: Lista de UserRecord (id, username, email).
         """
-        return self.db.select_all(
-            "SELECT id, username, email FROM users WHERE deleted_at IS NULL ORDER BY id ASC;"
+        return self.db.keyset(
+            "SELECT id, username, email FROM users WHERE deleted_at IS NULL",
+            after=None if after_id is None else (after_id,),
+            before=None if before_id is None else (before_id,),
+            limit=limit, record=UserRecord
         )
 
 
-    def authenticate(self, username: str, password: str) -> int | None:
+    def count(self) -> int:
+        """
+        Cuenta los usuarios activos.
+        """
+        row = self.db.select_one("SELECT COUNT(*) FROM users WHERE deleted_at IS NULL;")
+        return row[0] if row else 0
+
+
+    def authenticate(self, username: str, password: str, source: str | None = None) -> int | None:
         """
         Autenticar un usuario activo por username.
 
+        Si el usuario o el origen están bloqueados por intentos fallidos
+        (ver retry_after) se rechaza sin calcular bcrypt. Si la contraseña es
+        correcta pero su hash se generó con un coste distinto del configurado,
+        se vuelve a hashear y se guarda.
+
+        Args:
+            source (str | None): origen del intento (puesto, IP) para limitarlo
+                también por origen.
+
         Returns:
             int | None: ID del usuario si autenticación correcta, None si falla.
         """
+        if self.throttle.retry_after(username, source) > 0:
+            return None
+
         row = self.db.select_one(
             "SELECT id, password FROM users WHERE username=? AND deleted_at IS NULL;",
             (username,)
         )
-        if not row:
+        if not row or not bcrypt.checkpw(password.encode("utf-8"), row[1].encode("utf-8")):
+            self.throttle.record_failure(username, source)
             return None
 
         user_id, hashed = row
-        if bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8")):
-            return user_id
-        return None
+        self.throttle.record_success(username)
+        if self.hash_rounds(hashed) != self.rounds:
+            self._rehash(user_id, hashed, password)
+        return user_id
+
+
+    def retry_after(self, username: str, source: str | None = None) -> float:
+        """
+        Segundos que faltan para que se acepte otro intento de inicio de
+        sesión de 'username' (o desde 'source'); 0 si no está bloqueado.
+        """
+        return self.throttle.retry_after(username, source)
+
+
+    def login(self, username: str, password: str, source: str | None = None) -> str | None:
+        """
+        Autentica al usuario y abre una sesión.
+
+        Returns:
+            str | None: token de sesión, o None si la autenticación falla.
+        """
+        user_id = self.authenticate(username, password, source)
+        if user_id is None:
+            return None
+        return self.sessions.create(user_id)
+
+
+    def verify_session(self, token: str) -> int | None:
+        """
+        Resuelve un token de sesión vigente al ID del usuario, sin bcrypt.
+        """
+        return self.sessions.validate(token)
+
+
+    def logout(self, token: str):
+        self.sessions.revoke(token)
+
+
+    def _rehash(self, user_id: int, old_hash: str, password: str):
+        """
+        Guarda la contraseña con el coste actual. Solo sustituye el hash que
+        se verificó, por si la contraseña cambió mientras tanto; un fallo no
+        impide el inicio de sesión.
+        """
+        self.db.update(
+            "UPDATE users SET password=? WHERE id=? AND password=?;",
+            (self._hash_password(password), user_id, old_hash)
+        )
 
 
     def soft_delete(self, user_id: int) -> dict | bool:
@@ -151,10 +414,13 @@ class User:
         
         # Proceder con el borrado suave
         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return self.db.update(
+        result = self.db.update(
             "UPDATE users SET deleted_at=? WHERE id=? AND deleted_at IS NULL;",
             (ts, user_id)
         )
+        if result:
+            self.sessions.revoke_user(user_id)
+        return result
 
 
     def find_id_by_username(self, username: str) -> int | None:
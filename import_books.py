@@ -0,0 +1,58 @@
+"""
+Importa libros desde un CSV (cabecera title,isbn,author,category) sin abrir
+la interfaz gráfica.
+
+Uso:
+    python import_books.py catalogo.csv [--db library.db] [--rejects rechazos.csv]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from clases.database import Database
+from clases.book import Book
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Importación masiva de libros desde CSV.")
+    parser.add_argument("csv", help="archivo CSV con columnas title, isbn, author, category")
+    parser.add_argument("--db", default="library.db", help="base de datos (por defecto library.db)")
+    parser.add_argument("--rejects", default=None, help="informe de filas rechazadas")
+    parser.add_argument("--batch-size", type=int, default=Book.IMPORT_BATCH, help="filas por transacción")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db, profile="performance")
+    try:
+        start = time.perf_counter()
+        summary = Book(db).import_csv(
+            args.csv,
+            rejects_path=args.rejects,
+            batch_size=args.batch_size,
+            progress=lambda read, imported: print(f"\r{read} leídas, {imported} importadas", end="", flush=True)
+        )
+        print()
+    except (OSError, ValueError) as e:
+        print("\n[ERROR]", e, file=sys.stderr)
+        return 1
+    except sqlite3.Error as e:
+        print("\n[ERROR] Base de datos:", e, file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Importados {summary['imported']} de {summary['read']} libros en {elapsed:.1f} s.")
+    if summary["skipped"]:
+        print(f"Omitidos {summary['skipped']} ya registrados.")
+    if summary["rejected"]:
+        print(f"Rechazados {summary['rejected']}: ver {summary['rejects_path']}")
+    if summary["error"]:
+        print("[ERROR] Base de datos:", summary["error"], file=sys.stderr)
+        print("Importación incompleta: los libros importados se conservan; "
+              "vuelva a ejecutarla para continuar.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
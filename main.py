@@ -1,43 +1,116 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import customtkinter as ctk
-from clases.database import Database
-from views.user_view import UserView
-from views.book_view import BookView
-from views.loan_view import LoanView
-from views.history_view import HistoryView
-from views.statistics_view import StatisticsView
+import sys
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """
+    Registra la duración de cada fase del arranque (importaciones y
+    construcción de la interfaz) para '--profile-startup'.
+    """
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.records = []
+        self._reported = 0
+
+
+    @contextmanager
+    def measure(self, label: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append((label, time.perf_counter() - t0))
+
+
+    def report(self, title: str = "Perfil de arranque"):
+        """
+        Imprime el desglose de los tiempos registrados desde el último informe.
+        """
+        if not self.enabled:
+            return
+        first_report = self._reported == 0
+        print(f"\n{title}")
+        print("-" * 52)
+        for label, seconds in self.records[self._reported:]:
+            print(f"{label:<40} {seconds * 1000:8.1f} ms")
+        self._reported = len(self.records)
+        if first_report:
+            print("-" * 52)
+            total = time.perf_counter() - self.start
+            print(f"{'Total hasta la primera ventana':<40} {total * 1000:8.1f} ms")
+
+
+profiler = StartupProfiler("--profile-startup" in sys.argv)
+
+with profiler.measure("import tkinter"):
+    import importlib
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+with profiler.measure("import customtkinter"):
+    import customtkinter as ctk
+with profiler.measure("import clases.database"):
+    from clases.database import Database
+with profiler.measure("import views.async_loader"):
+    from views.async_loader import AsyncLoader
 
 class App(ctk.CTk):
     """
     Aplicación principal que configura la interfaz gráfica.
+
+    Las vistas de cada pestaña se importan y construyen la primera vez que
+    se selecciona la pestaña.
     """
+    # (nombre de pestaña, módulo, clase de la vista)
+    TABS = [
+        ("Libros", "views.book_view", "BookView"),
+        ("Usuarios", "views.user_view", "UserView"),
+        ("Préstamos y Devoluciones", "views.loan_view", "LoanView"),
+        ("Historial", "views.history_view", "HistoryView"),
+        ("Estadísticas", "views.statistics_view", "StatisticsView"),
+    ]
+
     def __init__(self):
-        super().__init__()
-        self.title("Sistema de Gestión de Biblioteca")
-        self.geometry("900x700")
+        with profiler.measure("App: ventana CTk"):
+            super().__init__()
+            self.title("Sistema de Gestión de Biblioteca")
+            self.geometry("900x700")
         
         # Configuración de CustomTkinter
         ctk.set_appearance_mode("Light")
         ctk.set_default_color_theme("blue")
         
-        # Conexión a la base de datos
-        self.db = Database()
+        # Conexión a la base de datos: un lector por hilo de carga en segundo
+        # plano y uno más para las lecturas del hilo de la interfaz
+        with profiler.measure("App: Database()"):
+            self.db = Database(readers=AsyncLoader.MAX_WORKERS + 1, profile="performance")
 
         # Precargar datos si la BD está vacía
-        self.db.seed_data()
+        with profiler.measure("App: seed_data"):
+            self.db.seed_data()
         
         # Configurar estilo Treeview
         self._setup_treeview_style()
         
         # Crear pestañas
-        self.tabview = ctk.CTkTabview(self)
+        self.views = {}
+        self._started = False
+        self._diagnostics = None
+        self.tabview = ctk.CTkTabview(self, command=self._on_tab_change)
         self.tabview.pack(fill="both", expand=True, padx=10, pady=10)
         self._create_tabs()
         
         # Crear menú
         self._create_menu()
 
+        # Informe cuando la ventana ya se ha dibujado
+        self.after_idle(self._startup_done)
+
+
+    def _startup_done(self):
+        self._started = True
+        profiler.report()
+
 
     def _setup_treeview_style(self):
         style = ttk.Style()
@@ -62,35 +135,111 @@ class App(ctk.CTk):
 
 
     def _create_tabs(self):
-        for tab_name in ["Libros", "Usuarios", "Préstamos y Devoluciones", "Historial", "Estadísticas"]:
+        for tab_name, _, _ in self.TABS:
             tab = self.tabview.add(tab_name)
             tab.grid_rowconfigure(0, weight=1)
             tab.grid_columnconfigure(0, weight=1)
 
-        # Cargar vistas en las pestañas
-        BookView(self.tabview.tab("Libros"), self.db).grid(row=0, column=0, sticky="nsew")
-        UserView(self.tabview.tab("Usuarios"), self.db).grid(row=0, column=0, sticky="nsew")
-        LoanView(self.tabview.tab("Préstamos y Devoluciones"), self.db).grid(row=0, column=0, sticky="nsew")
-        HistoryView(self.tabview.tab("Historial"), self.db).grid(row=0, column=0, sticky="nsew")
-        StatisticsView(self.tabview.tab("Estadísticas"), self.db).grid(row=0, column=0, sticky="nsew")
+        # Solo se construye la pestaña visible; el resto al seleccionarla
+        self._ensure_view(self.tabview.get())
+
+
+    def _on_tab_change(self):
+        self._ensure_view(self.tabview.get())
+
+
+    def _ensure_view(self, tab_name: str):
+        """
+        Importa y construye la vista de una pestaña si aún no existe.
+        """
+        if tab_name in self.views:
+            return self.views[tab_name]
+        module, class_name = next((m, c) for name, m, c in self.TABS if name == tab_name)
+        with profiler.measure(f"import {module}"):
+            view_cls = getattr(importlib.import_module(module), class_name)
+        with profiler.measure(f"construir {class_name}"):
+            view = view_cls(self.tabview.tab(tab_name), self.db)
+            view.grid(row=0, column=0, sticky="nsew")
+        self.views[tab_name] = view
+        # Las pestañas construidas tras el arranque se informan por separado
+        if self._started:
+            profiler.report(f"Pestaña '{tab_name}'")
+        return view
 
 
     def _create_menu(self):
         menubar = tk.Menu(self)
         self.config(menu=menubar)
         file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Importar libros (CSV)...", command=self._import_books)
+        file_menu.add_separator()
         file_menu.add_command(label="Salir", command=self.on_closing)
         menubar.add_cascade(label="Archivo", menu=file_menu)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_command(label="Diagnóstico...", command=self._show_diagnostics)
+        menubar.add_cascade(label="Herramientas", menu=tools_menu)
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="Acerca de...", command=self._show_about_dialog)
         menubar.add_cascade(label="Ayuda", menu=help_menu)
 
 
+    def _import_books(self):
+        """
+        Importa un CSV de libros en segundo plano y muestra el resumen.
+        """
+        path = filedialog.askopenfilename(
+            title="Importar libros",
+            filetypes=[("CSV", "*.csv"), ("Todos los archivos", "*.*")]
+        )
+        if not path:
+            return
+        from clases.book import Book
+
+        def done(summary):
+            text = f"Importados {summary['imported']} de {summary['read']} libros."
+            if summary["skipped"]:
+                text += f"\n\nOmitidos {summary['skipped']} ya registrados."
+            if summary["rejected"]:
+                text += f"\n\nRechazados {summary['rejected']}; ver:\n{summary['rejects_path']}"
+            if summary["error"]:
+                text += (f"\n\nImportación incompleta por un error de la base de datos:\n{summary['error']}"
+                         "\n\nLos libros importados se conservan; vuelva a importar el archivo para continuar.")
+                messagebox.showwarning("Importar libros", text)
+            else:
+                messagebox.showinfo("Importar libros", text)
+            view = self.views.get("Libros")
+            if view is not None:
+                view.refresh()
+
+        def failed(error):
+            messagebox.showerror("Importar libros", str(error))
+
+        def set_busy(busy):
+            suffix = " — importando libros…" if busy else ""
+            self.title("Sistema de Gestión de Biblioteca" + suffix)
+
+        loader = AsyncLoader(self, on_busy=set_busy)
+        loader.submit("import", lambda: Book(self.db).import_csv(path), done, failed)
+
+
+    def _show_diagnostics(self):
+        """
+        Abre (o trae al frente) la ventana de diagnóstico de consultas SQL.
+        """
+        if self._diagnostics is not None and self._diagnostics.winfo_exists():
+            self._diagnostics.refresh()
+            self._diagnostics.lift()
+            return
+        from views.diagnostics_window import DiagnosticsWindow
+        self._diagnostics = DiagnosticsWindow(self, self.db)
+
+
     def _show_about_dialog(self):
         messagebox.showinfo("Acerca de", "Sistema de Gestión de Biblioteca\n2025")
 
 
     def on_closing(self):
+        AsyncLoader.shutdown()
         if self.db:
             self.db.close()
         self.destroy()
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import TclError
+
+class AsyncLoader:
+    """
+    Ejecuta consultas en un pool de hilos y entrega el resultado en el hilo de
+    Tk mediante after(), para no congelar la interfaz.
+
+    Cada tarea se identifica con una clave: si se lanza otra tarea con la misma
+    clave (p. ej. el usuario pulsa Refrescar dos veces), la anterior se cancela
+    si aún no empezó y, si ya estaba en curso, su resultado se descarta.
+    """
+    MAX_WORKERS = 4
+    POLL_MS = 16
+
+    _executor = None
+
+    def __init__(self, widget, on_busy=None):
+        """
+        Args:
+            widget: Widget de Tk usado para programar los after().
+            on_busy: función opcional on_busy(bool) para mostrar un indicador
+                de carga mientras haya tareas pendientes.
+        """
+        self.widget = widget
+        self.on_busy = on_busy
+        self._pending = {}   # clave -> Future de la última tarea lanzada
+
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """
+        Pool de hilos compartido por todas las vistas.
+        """
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=cls.MAX_WORKERS, thread_name_prefix="loader")
+        return cls._executor
+
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Detiene el pool descartando las tareas pendientes (al cerrar la app).
+        """
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+
+    def submit(self, key, func, on_done, on_error=None):
+        """
+        Lanza func() en segundo plano y llama a on_done(resultado) en el hilo de Tk.
+
+        Args:
+            key: clave de la tarea; una tarea nueva con la misma clave sustituye a la anterior.
+            func: función sin argumentos que se ejecuta en el pool.
+            on_done: función que recibe el resultado.
+            on_error: función opcional que recibe la excepción si func() falla.
+        """
+        previous = self._pending.get(key)
+        if previous is not None:
+            previous.cancel()
+        future = self.executor().submit(func)
+        self._pending[key] = future
+        self._set_busy()
+        self._poll(key, future, on_done, on_error)
+
+
+    def cancel(self, key=None):
+        """
+        Cancela la tarea de una clave, o todas si no se indica clave.
+        """
+        keys = [key] if key is not None else list(self._pending)
+        for k in keys:
+            future = self._pending.pop(k, None)
+            if future is not None:
+                future.cancel()
+        self._set_busy()
+
+
+    def is_busy(self) -> bool:
+        return bool(self._pending)
+
+
+    def _poll(self, key, future, on_done, on_error):
+        """
+        Comprueba periódicamente si la tarea terminó y entrega el resultado.
+        """
+        try:
+            if not self.widget.winfo_exists():
+                future.cancel()
+                return
+            if not future.done():
+                self.widget.after(self.POLL_MS, self._poll, key, future, on_done, on_error)
+                return
+        except TclError:
+            # El widget fue destruido
+            future.cancel()
+            return
+
+        # Tarea sustituida por una más reciente: se descarta
+        if self._pending.get(key) is not future:
+            return
+        del self._pending[key]
+        self._set_busy()
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None:
+            on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print("[ERROR] Carga en segundo plano:", error)
+
+
+    def _set_busy(self):
+        if self.on_busy is not None:
+            self.on_busy(self.is_busy())
@@ -1,13 +1,20 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from clases.book import Book
+from clases.records import BookRecord
 from views.forms.book_form import BookForm
+from views.widgets.virtual_tree import VirtualTreeview
 
 class BookView(ctk.CTkFrame):
     """
     Vista de libros que muestra un Treeview con operaciones básicas:
-    crear, listar y borrar (soft delete), con columnas optimizadas.
+    crear, listar, buscar y borrar (soft delete), con columnas optimizadas.
+
+    La búsqueda se lanza al dejar de escribir (SEARCH_DELAY_MS) y se ejecuta
+    en segundo plano con Book.search; con el cuadro vacío se vuelve al listado.
     """
+    SEARCH_DELAY_MS = 250
+
     def __init__(self, master, db):
         """
         Inicializa la vista de libros y construye la interfaz.
@@ -18,6 +25,8 @@ class BookView(ctk.CTkFrame):
         """
         super().__init__(master)
         self.manager = Book(db)
+        self._query = ""
+        self._search_job = None
 
         # Configuración del layout
         self.grid_columnconfigure(0, weight=1)
@@ -39,10 +48,20 @@ class BookView(ctk.CTkFrame):
         ctk.CTkButton(frame_btn, text="Nuevo Libro", command=self.open_form).pack(side="left", padx=5, pady=5)
         ctk.CTkButton(frame_btn, text="🔄 Refrescar", command=self.refresh).pack(side="left", padx=5, pady=5)
         ctk.CTkButton(frame_btn, text="Borrar Libro", command=self.delete, fg_color="red", hover_color="#A00116", text_color="white").pack(side="right", padx=5, pady=5)
+        self.search_entry = ctk.CTkEntry(frame_btn, width=260, placeholder_text="🔍 Buscar por título, autor o categoría")
+        self.search_entry.pack(side="right", padx=5, pady=5)
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
 
-        # Configuración del Treeview.
+        # Configuración del Treeview (virtualizado: solo se cargan las filas visibles).
         cols = ("ID", "Titulo", "ISBN", "Autor", "Categoría", "Disponible")
-        self.tree = ttk.Treeview(self, columns=cols, show="headings")
+        self.table = VirtualTreeview(
+            self,
+            columns=cols,
+            fetch=lambda after, before, limit: self.manager.list(after_id=after, before_id=before, limit=limit),
+            key=lambda book: book.id,
+            format_row=self._format_row
+        )
+        self.tree = self.table.tree
 
         self.tree.column("ID", width=50, anchor="center", stretch=False)
         self.tree.heading("ID", text="ID")
@@ -62,7 +81,7 @@ class BookView(ctk.CTkFrame):
         self.tree.column("Disponible", width=80, anchor="center", stretch=False)
         self.tree.heading("Disponible", text="Disponible")
 
-        self.tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.table.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
 
         # Cargar datos
         self.refresh()
@@ -70,13 +89,40 @@ class BookView(ctk.CTkFrame):
 
     def refresh(self):
         """
-        Refresca la lista de libros en el Treeview.
+        Refresca la lista de libros (o los resultados de la búsqueda actual).
+        """
+        if self._query:
+            query = self._query
+            self.table.show_result(lambda: self.manager.search(query), limit=Book.SEARCH_LIMIT)
+        else:
+            self.table.refresh()
+
+
+    def _on_search_key(self, event=None):
+        """
+        Reprograma la búsqueda en cada pulsación para lanzarla solo cuando
+        el usuario deja de escribir.
+        """
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self._search)
+
+
+    def _search(self):
+        self._search_job = None
+        query = self.search_entry.get().strip()
+        if query == self._query:
+            return
+        self._query = query
+        self.refresh()
+
+
+    @staticmethod
+    def _format_row(book: BookRecord) -> tuple:
+        """
+        Muestra la disponibilidad como 'Si'/'No'.
         """
-        self.tree.delete(*self.tree.get_children())
-        for row in self.manager.list():
-            vals = list(row)
-            vals[5] = "Si" if vals[5] else "No"
-            self.tree.insert("", "end", values=vals)
+        return book.id, book.title, book.isbn, book.author, book.category, "Si" if book.available else "No"
 
 
     def open_form(self):
@@ -90,9 +136,8 @@ class BookView(ctk.CTkFrame):
         """
         Elimina (soft delete) el libro actualmente seleccionado.
         """
-        sel = self.tree.selection()
-        if sel:
-            bid = self.tree.item(sel[0])['values'][0]
+        book = self.table.selected_row()
+        if book is not None:
             if messagebox.askyesno("Confirmar", "¿Borrar libro?"):
-                self.manager.soft_delete(int(bid))
+                self.manager.soft_delete(book.id)
                 self.refresh()
@@ -0,0 +1,76 @@
+import customtkinter as ctk
+from tkinter import ttk
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    """
+    Ventana "Diagnóstico": sentencias SQL con más tiempo total acumulado y
+    registro de consultas lentas con su plan (ver QueryProfiler).
+    """
+    TOP = 30
+
+    def __init__(self, master, db):
+        super().__init__(master)
+        self.title("Diagnóstico")
+        self.geometry("1000x600")
+        self.profiler = db.profiler
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=3)
+        self.grid_rowconfigure(3, weight=2)
+
+        # Botones
+        frame_btn = ctk.CTkFrame(self)
+        frame_btn.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
+        ctk.CTkButton(frame_btn, text="🔄 Actualizar", command=self.refresh).pack(side="left", padx=5, pady=5)
+        ctk.CTkButton(frame_btn, text="Reiniciar contadores", command=self.reset).pack(side="left", padx=5, pady=5)
+        self.summary = ctk.CTkLabel(frame_btn, text="")
+        self.summary.pack(side="right", padx=10)
+
+        # Sentencias por tiempo total
+        cols = ("Sentencia", "Llamadas", "Total (ms)", "Media (ms)", "p95 (ms)", "Máx (ms)", "Filas")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings")
+        for col in cols:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=80, anchor="e", stretch=False)
+        self.tree.column("Sentencia", width=480, anchor="w", stretch=True)
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=10)
+
+        # Consultas lentas
+        ctk.CTkLabel(self, text=f"Consultas lentas (≥ {self.profiler.slow_ms:.0f} ms)").grid(
+            row=2, column=0, padx=10, pady=(10, 0), sticky="w")
+        self.txt_slow = ctk.CTkTextbox(self, state="disabled")
+        self.txt_slow.grid(row=3, column=0, sticky="nsew", padx=10, pady=(0, 10))
+
+        self.refresh()
+
+
+    def refresh(self):
+        """
+        Vuelve a leer las estadísticas del profiler.
+        """
+        top = self.profiler.top(self.TOP)
+        self.tree.delete(*self.tree.get_children())
+        for e in top:
+            p95 = "> 1000" if e["p95_ms"] == float("inf") else f"≤ {e['p95_ms']:g}"
+            self.tree.insert("", "end", values=(
+                e["sql"], e["count"], f"{e['total_ms']:.1f}", f"{e['avg_ms']:.2f}",
+                p95, f"{e['max_ms']:.1f}", e["rows"],
+            ))
+        total = sum(e["total_ms"] for e in top)
+        self.summary.configure(text=f"{len(top)} sentencias · {total:.0f} ms en total")
+
+        lines = []
+        for q in self.profiler.slow_queries():
+            lines.append(f"[{q['time']}] {q['ms']:.1f} ms  {q['sql']}")
+            lines.append(f"    parámetros: {q['params']}")
+            lines.extend(f"    {step}" for step in q["plan"])
+            lines.append("")
+        self.txt_slow.configure(state="normal")
+        self.txt_slow.delete("1.0", "end")
+        self.txt_slow.insert("1.0", "\n".join(lines) or "Sin consultas lentas.")
+        self.txt_slow.configure(state="disabled")
+
+
+    def reset(self):
+        self.profiler.reset()
+        self.refresh()
@@ -0,0 +1,131 @@
+import customtkinter as ctk
+from views.widgets.typeahead import TypeaheadEntry
+
+class BatchLoanForm(ctk.CTkToplevel):
+    """
+    Formulario modal para préstamos o devoluciones en lote a partir de una
+    lista de ISBN escaneados (uno por línea).
+    """
+    MODES = ("Préstamo", "Devolución")
+
+    def __init__(self, master, loan_manager, user_manager, book_manager, refresh_callback):
+        super().__init__(master)
+        self.title("Préstamos en Lote")
+        self.geometry("520x560")
+        self.grab_set()
+
+        self.loan_mgr = loan_manager
+        self.user_mgr = user_manager
+        self.book_mgr = book_manager
+        self.callback = refresh_callback
+
+        # Grid responsivo
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=3)
+        self.grid_rowconfigure(4, weight=1)
+        self.grid_rowconfigure(6, weight=1)
+
+        # Error general.
+        self.general_error = ctk.CTkLabel(self, text="", text_color="red")
+        self.general_error.grid(row=0, column=0, columnspan=2, padx=20, pady=(10,5), sticky="w")
+
+        # Modo
+        self.mode = ctk.CTkSegmentedButton(self, values=list(self.MODES), command=self._on_mode)
+        self.mode.set(self.MODES[0])
+        self.mode.grid(row=1, column=0, columnspan=2, padx=10, pady=(0,5), sticky="ew")
+
+        # Selector Usuario (solo para préstamos)
+        ctk.CTkLabel(self, text="Usuario:").grid(row=2, column=0, padx=10, pady=(10,0), sticky="w")
+        self.ta_user = TypeaheadEntry(
+            self,
+            search=lambda text, limit: self.user_mgr.search_prefix(text, limit=limit),
+            format_option=lambda u: f"{u.username} ({u.email})",
+            placeholder="Escriba el nombre de usuario…",
+            visible_rows=4
+        )
+        self.ta_user.grid(row=2, column=1, padx=10, pady=(10,0), sticky="new")
+
+        # Lista de ISBN
+        ctk.CTkLabel(self, text="ISBN (uno por línea):").grid(row=3, column=0, columnspan=2, padx=10, pady=(10,0), sticky="w")
+        self.txt_isbns = ctk.CTkTextbox(self, height=150)
+        self.txt_isbns.grid(row=4, column=0, columnspan=2, padx=10, pady=(0,5), sticky="nsew")
+
+        # Botón Procesar
+        ctk.CTkButton(self, text="Procesar", command=self.save).grid(row=5, column=0, columnspan=2, pady=10, padx=20, sticky="ew")
+
+        # Informe de resultados
+        self.txt_report = ctk.CTkTextbox(self, height=150, state="disabled")
+        self.txt_report.grid(row=6, column=0, columnspan=2, padx=10, pady=(0,10), sticky="nsew")
+
+
+    def _on_mode(self, mode: str):
+        """
+        Habilita el selector de usuario solo en modo préstamo.
+        """
+        self.ta_user.configure_state("normal" if mode == self.MODES[0] else "disabled")
+
+
+    def _read_isbns(self) -> list[str]:
+        """
+        Obtiene los ISBN no vacíos del cuadro de texto, en orden.
+        """
+        lines = self.txt_isbns.get("1.0", "end").splitlines()
+        return [line.strip() for line in lines if line.strip()]
+
+
+    def _show_report(self, lines: list[str]):
+        """
+        Muestra el informe por elemento en el cuadro de resultados.
+        """
+        self.txt_report.configure(state="normal")
+        self.txt_report.delete("1.0", "end")
+        self.txt_report.insert("1.0", "\n".join(lines))
+        self.txt_report.configure(state="disabled")
+
+
+    def save(self):
+        """
+        Resuelve los ISBN y registra el lote a través de la capa de negocio.
+        """
+        self.general_error.configure(text="")
+        isbns = self._read_isbns()
+        if not isbns:
+            self.general_error.configure(text="Debe introducir al menos un ISBN.")
+            return
+
+        lending = self.mode.get() == self.MODES[0]
+        user_id = self.ta_user.get()
+        if lending and user_id is None:
+            self.general_error.configure(text="Debe seleccionar un usuario válido.")
+            return
+
+        ids = self.book_mgr.get_ids_by_isbn(isbns)
+        lines = []
+        if lending:
+            book_ids = [ids.get(self.book_mgr.normalize_isbn(i)) for i in isbns]
+            pairs = [(user_id, bid) for bid in book_ids if bid is not None]
+            results = iter(self.loan_mgr.lend_many(pairs))
+            for isbn, book_id in zip(isbns, book_ids):
+                if book_id is None:
+                    lines.append(f"✘ {isbn}: ISBN no encontrado.")
+                    continue
+                _, res = next(results)
+                lines.append(f"✔ {isbn}" if res is True else f"✘ {isbn}: {res}")
+        else:
+            active = self.loan_mgr.get_active_by_books(list(ids.values()))
+            loan_ids = []
+            for isbn in isbns:
+                book_id = ids.get(self.book_mgr.normalize_isbn(isbn))
+                loan_ids.append(active.get(book_id))
+            results = iter(self.loan_mgr.return_many([lid for lid in loan_ids if lid is not None]))
+            for isbn, lid in zip(isbns, loan_ids):
+                if lid is None:
+                    lines.append(f"✘ {isbn}: sin préstamo activo.")
+                    continue
+                _, ok = next(results)
+                lines.append(f"✔ {isbn}" if ok else f"✘ {isbn}: préstamo ya cerrado.")
+
+        ok = sum(1 for line in lines if line.startswith("✔"))
+        lines.insert(0, f"Procesados {ok} de {len(isbns)}.")
+        self._show_report(lines)
+        self.callback()
@@ -1,14 +1,18 @@
 import customtkinter as ctk
 from tkinter import messagebox
+from views.widgets.typeahead import TypeaheadEntry
 
 class LoanForm(ctk.CTkToplevel):
     """
     Formulario modal para seleccionar un usuario y un libro disponible.
+
+    Los selectores buscan por prefijo mientras se escribe (User.search_prefix,
+    Book.search_prefix), así que el formulario no carga todos los registros.
     """
     def __init__(self, master, loan_manager, user_manager, book_manager, refresh_callback):
         super().__init__(master)
         self.title("Nuevo Préstamo")
-        self.geometry("400x280")
+        self.geometry("460x480")
         self.grab_set()
 
         self.loan_mgr = loan_manager
@@ -20,35 +24,31 @@ class LoanForm(ctk.CTkToplevel):
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=3)
 
-        # Obtener datos.
-        users = self.user_mgr.list()
-        books = self.book_mgr.list(available_only=True)
-        self.user_map = {u[1]: u[0] for u in users}
-        self.book_map = {b[1]: b[0] for b in books}
-
-        self.user_names = ["--- Seleccione Usuario."] + list(self.user_map.keys()) if users else ["--- Seleccione Usuario."]
-        self.book_titles = ["--- Seleccione Libro."] + list(self.book_map.keys()) if books else ["--- Seleccione Libro."]
-
-        self.user_placeholder = self.user_names[0]
-        self.book_placeholder = self.book_titles[0]
-
         # Error general.
         self.general_error = ctk.CTkLabel(self, text="", text_color="red")
         self.general_error.grid(row=0, column=0, columnspan=2, padx=20, pady=(10,5), sticky="w")
 
         # Selector Usuario
         ctk.CTkLabel(self, text="Usuario:").grid(row=1, column=0, padx=10, pady=(10,0), sticky="w")
-        self.om_user = ctk.CTkOptionMenu(self, values=self.user_names, width=220)
-        self.om_user.set(self.user_placeholder)
-        self.om_user.grid(row=1, column=1, padx=10, pady=(10,0), sticky="ew")
+        self.ta_user = TypeaheadEntry(
+            self,
+            search=lambda text, limit: self.user_mgr.search_prefix(text, limit=limit),
+            format_option=lambda u: f"{u.username} ({u.email})",
+            placeholder="Escriba el nombre de usuario…"
+        )
+        self.ta_user.grid(row=1, column=1, padx=10, pady=(10,0), sticky="new")
         self.error_user = ctk.CTkLabel(self, text="", text_color="red")
         self.error_user.grid(row=2, column=0, columnspan=2, padx=10, sticky="w")
 
         # Selector Libro
         ctk.CTkLabel(self, text="Libro:").grid(row=3, column=0, padx=10, pady=(10,0), sticky="w")
-        self.om_book = ctk.CTkOptionMenu(self, values=self.book_titles, width=220)
-        self.om_book.set(self.book_placeholder)
-        self.om_book.grid(row=3, column=1, padx=10, pady=(10,0), sticky="ew")
+        self.ta_book = TypeaheadEntry(
+            self,
+            search=lambda text, limit: self.book_mgr.search_prefix(text, available_only=True, limit=limit),
+            format_option=lambda b: f"{b.title} — {b.author} [{b.isbn}]",
+            placeholder="Escriba el título o el ISBN…"
+        )
+        self.ta_book.grid(row=3, column=1, padx=10, pady=(10,0), sticky="new")
         self.error_book = ctk.CTkLabel(self, text="", text_color="red")
         self.error_book.grid(row=4, column=0, columnspan=2, padx=10, sticky="w")
 
@@ -56,7 +56,7 @@ class LoanForm(ctk.CTkToplevel):
         ctk.CTkButton(self, text="Prestar", command=self.save).grid(row=5, column=0, columnspan=2, pady=20, padx=20, sticky="ew")
 
 
-    def _validate_ui(self, u_name: str, b_name: str) -> bool:
+    def _validate_ui(self, user_id: int | None, book_id: int | None) -> bool:
         """
         Valida que se hayan seleccionado opciones válidas.
         """
@@ -65,11 +65,11 @@ class LoanForm(ctk.CTkToplevel):
         self.error_user.configure(text="")
         self.error_book.configure(text="")
 
-        if u_name == self.user_placeholder or u_name not in self.user_map:
+        if user_id is None:
             self.error_user.configure(text="Debe seleccionar un usuario válido.")
             is_valid = False
 
-        if b_name == self.book_placeholder or b_name not in self.book_map:
+        if book_id is None:
             self.error_book.configure(text="Debe seleccionar un libro disponible.")
             is_valid = False
 
@@ -80,18 +80,15 @@ class LoanForm(ctk.CTkToplevel):
         """
         Valida y registra el préstamo a través de la capa de negocio.
         """
-        u_name = self.om_user.get()
-        b_name = self.om_book.get()
+        user_id = self.ta_user.get()
+        book_id = self.ta_book.get()
 
-        if not self._validate_ui(u_name, b_name):
+        if not self._validate_ui(user_id, book_id):
             return
 
-        user_id = self.user_map[u_name]
-        book_id = self.book_map[b_name]
-
         res = self.loan_mgr.lend_book(user_id, book_id)
         if res is True:
-            messagebox.showinfo("Éxito", f"Préstamo registrado: {b_name} a {u_name}.")
+            messagebox.showinfo("Éxito", f"Préstamo registrado: {self.ta_book.selected_text} a {self.ta_user.selected_text}.")
             self.callback()
             self.destroy()
         else:
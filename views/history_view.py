@@ -1,6 +1,8 @@
 import customtkinter as ctk
 from tkinter import ttk
 from clases.loan import Loan 
+from clases.records import LoanRecord
+from views.widgets.virtual_tree import VirtualTreeview
 
 class HistoryView(ctk.CTkFrame):
     """
@@ -43,9 +45,16 @@ class HistoryView(ctk.CTkFrame):
             command=self.refresh
         ).pack(side="left", padx=5, pady=5)
 
-        # Configuración de la tabla.
+        # Configuración de la tabla (virtualizada: solo se cargan las filas visibles).
         cols = ("ID", "Libro", "Usuario", "Prestado", "Devuelto")
-        self.tree = ttk.Treeview(self, columns=cols, show="headings")
+        self.table = VirtualTreeview(
+            self,
+            columns=cols,
+            fetch=lambda after, before, limit: self.manager.get_history(after=after, before=before, limit=limit),
+            key=lambda loan: (loan.loan_date, loan.id),
+            format_row=self._format_row
+        )
+        self.tree = self.table.tree
 
         self.tree.column("ID", width=0, minwidth=0, stretch=False)
         self.tree.heading("ID", text="")
@@ -62,7 +71,7 @@ class HistoryView(ctk.CTkFrame):
         self.tree.column("Devuelto", width=120, anchor="center")
         self.tree.heading("Devuelto", text="Devuelto")
 
-        self.tree.grid(row=2, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.table.grid(row=2, column=0, sticky="nsew", padx=10, pady=(0, 10))
 
         # Cargar datos al inicio
         self.refresh()
@@ -70,12 +79,15 @@ class HistoryView(ctk.CTkFrame):
 
     def refresh(self):
         """
-        Carga el historial completo usando el método get_history de Loan.
+        Carga el historial usando el método get_history de Loan, por páginas.
         """
-        self.tree.delete(*self.tree.get_children())
-        
-        for row in self.manager.get_history():
-            vals = list(row)
-            # Si return_date es NULL, se muestra como "ACTIVO"
-            if not vals[4]: vals[4] = "ACTIVO"
-            self.tree.insert("", "end", values=vals)
+        self.table.refresh()
+
+
+    @staticmethod
+    def _format_row(loan: LoanRecord) -> tuple:
+        """
+        Si return_date es NULL, se muestra como "ACTIVO".
+        """
+        return loan.id, loan.title, loan.username, loan.loan_date, loan.return_date or "ACTIVO"
+
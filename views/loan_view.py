@@ -3,7 +3,10 @@ from tkinter import ttk, messagebox
 from clases.loan import Loan
 from clases.book import Book
 from clases.user import User
+from clases.records import LoanRecord
 from views.forms.loan_form import LoanForm
+from views.forms.batch_loan_form import BatchLoanForm
+from views.widgets.virtual_tree import VirtualTreeview
 
 class LoanView(ctk.CTkFrame):
     """
@@ -33,20 +36,20 @@ class LoanView(ctk.CTkFrame):
         frame_btn = ctk.CTkFrame(self)
         frame_btn.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
         ctk.CTkButton(frame_btn, text="Nuevo Préstamo", command=self.open_form).pack(side="left", padx=5, pady=5)
+        ctk.CTkButton(frame_btn, text="Lote (ISBN)", command=self.open_batch_form).pack(side="left", padx=5, pady=5)
         ctk.CTkButton(frame_btn, text="🔄 Refrescar", command=self.refresh).pack(side="left", padx=5, pady=5)
         ctk.CTkButton(frame_btn, text="Devolver Libro", command=self.return_book, fg_color="orange", hover_color="#D4881D", text_color="white").pack(side="right", padx=5, pady=5)
 
-        # Configuración del Treeview.
-        cols = ("ID", "Libro", "Usuario", "Fecha", "BookID")
-        self.tree = ttk.Treeview(
+        # Configuración del Treeview (virtualizado: solo se cargan las filas visibles).
+        cols = ("ID", "Libro", "Usuario", "Fecha")
+        self.table = VirtualTreeview(
             self,
             columns=cols,
-            displaycolumns=("ID", "Libro", "Usuario", "Fecha"),  # ocultamos BookID
-            show="headings"
+            fetch=lambda after, before, limit: self.loan_mgr.get_active_loans(after=after, before=before, limit=limit),
+            key=lambda loan: (loan.loan_date, loan.id),
+            format_row=self._format_row
         )
-
-        self.tree.column("BookID", width=0, minwidth=0, stretch=False)
-        self.tree.heading("BookID", text="")
+        self.tree = self.table.tree
 
         self.tree.column("ID", width=60, anchor="center")
         self.tree.heading("ID", text="ID")
@@ -60,7 +63,7 @@ class LoanView(ctk.CTkFrame):
         self.tree.column("Fecha", width=140, anchor="center")
         self.tree.heading("Fecha", text="Fecha Préstamo")
 
-        self.tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.table.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
 
         # Cargar datos
         self.refresh()
@@ -70,9 +73,16 @@ class LoanView(ctk.CTkFrame):
         """
         Carga y actualiza la tabla de préstamos activos.
         """
-        self.tree.delete(*self.tree.get_children())
-        for row in self.loan_mgr.get_active_loans():
-            self.tree.insert("", "end", values=row)
+        self.table.refresh()
+
+
+    @staticmethod
+    def _format_row(loan: LoanRecord) -> tuple:
+        """
+        Valores de las columnas de la tabla. El book_id para la devolución se
+        toma del registro seleccionado (VirtualTreeview.selected_row).
+        """
+        return loan.id, loan.title, loan.username, loan.loan_date
 
 
     def open_form(self):
@@ -82,24 +92,27 @@ class LoanView(ctk.CTkFrame):
         LoanForm(self, self.loan_mgr, self.user_mgr, self.book_mgr, self.refresh)
 
 
+    def open_batch_form(self):
+        """
+        Abre el formulario de préstamos/devoluciones en lote.
+        """
+        BatchLoanForm(self, self.loan_mgr, self.user_mgr, self.book_mgr, self.refresh)
+
+
     def return_book(self):
         """
         Procesa la devolución del préstamo seleccionado.
         """
-        sel = self.tree.selection()
-        if not sel:
+        loan = self.table.selected_row()
+        if loan is None:
             messagebox.showwarning("Advertencia", "Seleccione un préstamo activo de la tabla.")
             return
 
-        vals = self.tree.item(sel[0])['values']
-        loan_id = vals[0]
-        book_id = vals[4]
-
         if messagebox.askyesno(
             "Devolución",
-            f"¿Registrar la devolución del libro '{vals[1]}' prestado a '{vals[2]}'?"
+            f"¿Registrar la devolución del libro '{loan.title}' prestado a '{loan.username}'?"
         ):
-            if self.loan_mgr.return_book(int(loan_id), int(book_id)):
+            if self.loan_mgr.return_book(loan.id, loan.book_id):
                 messagebox.showinfo("Éxito", "Devolución registrada correctamente.")
                 self.refresh()
             else:
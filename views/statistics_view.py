@@ -1,18 +1,31 @@
+import importlib
 import customtkinter as ctk
-import pandas as pd
-from views.stats.most_borrowed_books import MostBorrowedBooksForm
-from views.stats.loans_per_month import LoansPerMonthForm
-from views.stats.top_authors import TopAuthorsForm
-from views.stats.recent_loans import RecentLoansForm
-from views.stats.category_loans import CategoryLoansForm
+from clases.statistics import Statistics
+from views.async_loader import AsyncLoader
 
 class StatisticsView(ctk.CTkFrame):
     """
     Vista de estadísticas con botones para abrir gráficas.
+
+    Cada gráfica se calcula en SQLite (Statistics) en segundo plano al abrirla;
+    matplotlib y las ventanas de views/stats se importan solo en ese momento.
+    El panel en vivo (StatsDashboard) muestra todas a la vez.
     """
+    # Gráficas: (módulo, clase de la ventana, método de Statistics)
+    CHARTS = (
+        ("views.stats.most_borrowed_books", "MostBorrowedBooksForm", "top_books"),
+        ("views.stats.loans_per_month", "LoansPerMonthForm", "loans_per_month"),
+        ("views.stats.top_authors", "TopAuthorsForm", "top_authors"),
+        ("views.stats.recent_loans", "RecentLoansForm", "recent_loans"),
+        ("views.stats.category_loans", "CategoryLoansForm", "loans_by_category"),
+    )
+
     def __init__(self, master, db):
         super().__init__(master)
         self.db = db
+        self.stats = Statistics(db)
+        self.loader = AsyncLoader(self, on_busy=self._set_busy)
+        self.dashboard = None
 
         ctk.CTkLabel(self, text="📊 Estadísticas 📊", font=("Arial", 16, "bold")).pack(pady=10)
 
@@ -65,36 +78,99 @@ class StatisticsView(ctk.CTkFrame):
             text_color="white"
         ).pack(side="left", padx=5)
 
-        self.load_data()
+        self.dashboard_button = ctk.CTkButton(
+            self.buttons_frame,
+            text="🖥 Panel en vivo",
+            command=self.toggle_dashboard,
+            fg_color="#4A4A4A",
+            hover_color="#333333",
+            text_color="white"
+        )
+        self.dashboard_button.pack(side="left", padx=5)
+
+        self.status = ctk.CTkLabel(self, text="")
+        self.status.pack(pady=5)
+
+        # Contadores de la caché de estadísticas
+        self.cache_label = ctk.CTkLabel(self, text="", text_color="gray")
+        self.cache_label.pack(side="bottom", pady=5)
 
 
-    def load_data(self):
+    def _set_busy(self, busy: bool):
+        self.status.configure(text="⏳ Cargando datos…" if busy else "")
+
+
+    def _update_cache_label(self):
+        info = self.stats.cache.stats()
+        self.cache_label.configure(
+            text=f"Caché: {info['hits']} aciertos / {info['misses']} fallos "
+                 f"({info['hit_rate']:.0%}), {info['invalidations']} invalidaciones"
+        )
+
+
+    def _open(self, module: str, class_name: str, query):
         """
-        Cargar datos desde la DB
+        Calcula los datos de una gráfica en segundo plano y abre su ventana.
+
+        Args:
+            module (str): módulo de views/stats con la ventana.
+            class_name (str): clase de la ventana.
+            query: función sin argumentos de Statistics que devuelve los datos.
         """
-        loans = self.db.select_all("""
-            SELECT books.id, books.title, books.author, books.category, books.available, loans.loan_date
-            FROM books
-            LEFT JOIN loans ON loans.book_id = books.id
-        """)
-        if not loans:
-            self.df = pd.DataFrame(columns=["book_id","title","author","category","available","loan_date"])
-        else:
-            self.df = pd.DataFrame(loans, columns=["book_id","title","author","category","available","loan_date"])
-            self.df["loan_date"] = pd.to_datetime(self.df["loan_date"])
+        def show(data):
+            self._update_cache_label()
+            form_cls = getattr(importlib.import_module(module), class_name)
+            form_cls.show(self, data)
+
+        self.loader.submit(class_name, query, show)
+
+
+    def toggle_dashboard(self):
+        """
+        Muestra u oculta el panel en vivo. Al ocultarlo se destruye para que
+        deje de refrescarse y libere la figura.
+        """
+        if self.dashboard is not None:
+            self.dashboard.destroy()
+            self.dashboard = None
+            self.dashboard_button.configure(text="🖥 Panel en vivo")
+            return
+
+        from views.stats.dashboard import StatsDashboard
+        panels = [
+            (
+                getattr(importlib.import_module(module), class_name),
+                getattr(self.stats, method),
+                Statistics.DEPENDS[method],
+            )
+            for module, class_name, method in self.CHARTS
+        ]
+        self.dashboard = StatsDashboard(self, self.db, panels)
+        self.dashboard.pack(fill="both", expand=True, padx=10, pady=5)
+        self.dashboard_button.configure(text="✖ Cerrar panel")
 
     # Abrir ventanas modales.
     def show_top_books(self):
-        MostBorrowedBooksForm(self, self.df)
+        self._open(*self.CHARTS[0][:2], self.stats.top_books)
 
     def show_loans_by_month(self):
-        LoansPerMonthForm(self, self.df)
+        self._open(*self.CHARTS[1][:2], self.stats.loans_per_month)
 
     def show_top_authors(self):
-        TopAuthorsForm(self, self.df)
+        self._open(*self.CHARTS[2][:2], self.stats.top_authors)
 
     def show_recent_loans(self):
-        RecentLoansForm(self, self.df)
+        self._open(*self.CHARTS[3][:2], self.stats.recent_loans)
 
     def show_category_loans(self):
-        CategoryLoansForm(self, self.df)
+        self._open(*self.CHARTS[4][:2], self.stats.loans_by_category)
+
+
+    def destroy(self):
+        """
+        Cancela las consultas pendientes y deja de escuchar los cambios de la
+        base de datos (el panel en vivo se destruye con sus hijos).
+        """
+        self.loader.cancel()
+        self.stats.close()
+        super().destroy()
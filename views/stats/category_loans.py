@@ -1,25 +1,19 @@
-import customtkinter as ctk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from views.stats.chart_window import BarChartWindow
 
-class CategoryLoansForm(ctk.CTkToplevel):
+class CategoryLoansForm(BarChartWindow):
     """
-    Ventana modal para mostrar préstamos por categoría.
+    Ventana para mostrar préstamos por categoría.
     """
-    def __init__(self, master, df):
-        super().__init__(master)
-        self.title("📂 Préstamos por Categoría")
-        self.geometry("700x500")
-        self.grab_set()
+    WINDOW_TITLE = "📂 Préstamos por Categoría"
+    TITLE = "Préstamos por Categoría"
+    COLOR = "#D0021B"
+    XLABEL = "Cantidad de préstamos"
+    YLABEL = "Categoría"
 
-        category_count = df['category'].value_counts()
-        fig, ax = plt.subplots(figsize=(8,5))
-        ax.barh(category_count.index[::-1], category_count.values[::-1], color="#D0021B")
-        ax.set_xlabel("Cantidad de préstamos")
-        ax.set_ylabel("Categoría")
-        ax.set_title("Préstamos por Categoría")
-        plt.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=self)
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-        canvas.draw()
+    @staticmethod
+    def labels_values(data):
+        """
+        Args:
+            data (list): tuplas (category, cantidad) de Statistics.loans_by_category.
+        """
+        return [row[0] for row in data][::-1], [row[1] for row in data][::-1]
@@ -0,0 +1,170 @@
+import customtkinter as ctk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+class BarChart:
+    """
+    Barras de una gráfica sobre unos Axes, actualizables en el sitio.
+
+    Con 'animated=True' las barras quedan fuera del dibujo normal de la figura
+    para poder redibujarlas con blitting (ver StatsDashboard).
+    """
+    def __init__(self, ax, color: str, horizontal: bool = True, animated: bool = False):
+        self.ax = ax
+        self.color = color
+        self.horizontal = horizontal
+        self.animated = animated
+        self.bars = None
+        self.labels = None
+
+
+    def set_data(self, labels: list, values: list) -> bool:
+        """
+        Actualiza las barras con etiquetas y valores nuevos.
+
+        Returns:
+            bool: True si cambió la disposición (número de barras, etiquetas o
+                escala) y hace falta redibujar la figura completa; False si
+                basta con redibujar las barras.
+        """
+        positions = list(range(len(values)))
+        relayout = self.bars is None or len(self.bars) != len(values) or labels != self.labels
+
+        if not relayout:
+            for bar, value in zip(self.bars, values):
+                if self.horizontal:
+                    bar.set_width(value)
+                else:
+                    bar.set_height(value)
+        else:
+            if self.bars is not None:
+                self.bars.remove()
+            plot = self.ax.barh if self.horizontal else self.ax.bar
+            self.bars = plot(positions, values, color=self.color, animated=self.animated)
+            if self.horizontal:
+                self.ax.set_yticks(positions)
+                self.ax.set_yticklabels(labels)
+            else:
+                self.ax.set_xticks(positions)
+                self.ax.set_xticklabels(labels)
+            self.labels = list(labels)
+
+        # Reescalar solo si los valores se salen del eje (o lo dejan casi vacío)
+        limit = self.ax.get_xlim()[1] if self.horizontal else self.ax.get_ylim()[1]
+        top = max(values, default=0)
+        if relayout or top > limit or (top and top < limit / 2):
+            self.ax.relim()
+            self.ax.autoscale_view()
+            relayout = True
+        return relayout
+
+
+    def draw_artists(self):
+        """
+        Dibuja solo las barras (para blitting).
+        """
+        if self.bars is not None:
+            for bar in self.bars:
+                self.ax.draw_artist(bar)
+
+
+    def clear(self):
+        self.bars = None
+        self.labels = None
+
+
+class BarChartWindow(ctk.CTkToplevel):
+    """
+    Ventana base para las gráficas de barras de estadísticas.
+
+    Usa matplotlib.figure.Figure directamente (sin el registro global de
+    pyplot), mantiene una sola ventana y un solo canvas por tipo de gráfica
+    y, al recibir datos nuevos, actualiza las barras existentes en lugar de
+    crear una figura nueva. Al cerrarla se liberan la figura y el canvas.
+
+    La ventana no es modal (sin grab_set) para que volver a pulsar el botón
+    de la gráfica llegue a show() y refresque la ventana abierta; se marca
+    como transitoria de la principal para que quede por encima de ella.
+
+    Las subclases definen los textos y colores, y labels_values(data).
+    """
+    TITLE = ""
+    WINDOW_TITLE = ""
+    GEOMETRY = "700x500"
+    COLOR = "#4A90E2"
+    XLABEL = ""
+    YLABEL = ""
+    HORIZONTAL = True
+
+    # Ventana abierta por clase de gráfica
+    _instances = {}
+
+    @classmethod
+    def show(cls, master, data):
+        """
+        Muestra la gráfica con 'data', reutilizando la ventana si ya está abierta.
+
+        Returns:
+            BarChartWindow: la ventana mostrada.
+        """
+        window = cls._instances.get(cls)
+        if window is not None and window.winfo_exists():
+            window.update_chart(data)
+            window.lift()
+            window.focus()
+            return window
+        window = cls(master, data)
+        cls._instances[cls] = window
+        return window
+
+
+    def __init__(self, master, data):
+        super().__init__(master)
+        self.title(self.WINDOW_TITLE)
+        self.geometry(self.GEOMETRY)
+        self.transient(master.winfo_toplevel())
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.figure = Figure(figsize=(8,5))
+        self.ax = self.figure.add_subplot()
+        self.ax.set_xlabel(self.XLABEL)
+        self.ax.set_ylabel(self.YLABEL)
+        self.ax.set_title(self.TITLE)
+        self.chart = BarChart(self.ax, self.COLOR, horizontal=self.HORIZONTAL)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.update_chart(data, redraw=False)
+        self.canvas.draw()
+
+
+    @staticmethod
+    def labels_values(data) -> tuple[list, list]:
+        """
+        Convierte las filas de Statistics en etiquetas y valores, en el orden
+        en que se dibujan (de abajo arriba en barras horizontales).
+        """
+        raise NotImplementedError
+
+
+    def update_chart(self, data, redraw: bool = True):
+        """
+        Actualiza las barras con datos nuevos. Si el número de barras no
+        cambia, solo se modifican sus longitudes y etiquetas.
+        """
+        if self.chart.set_data(*self.labels_values(data)):
+            self.figure.tight_layout()
+        if redraw:
+            self.canvas.draw_idle()
+
+
+    def close(self):
+        """
+        Cierra la ventana liberando el canvas y la figura.
+        """
+        if type(self)._instances.get(type(self)) is self:
+            del type(self)._instances[type(self)]
+        self.canvas.get_tk_widget().destroy()
+        self.figure.clear()
+        self.chart.clear()
+        self.destroy()
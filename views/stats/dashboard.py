@@ -0,0 +1,174 @@
+import time
+import customtkinter as ctk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from views.async_loader import AsyncLoader
+from views.stats.chart_window import BarChart
+
+class _Panel:
+    """
+    Una gráfica del panel: su ventana de referencia (textos, colores y
+    conversión de datos), la consulta de Statistics, las tablas de las que
+    depende y los últimos datos.
+    """
+    __slots__ = ("form_cls", "query", "tables", "chart", "data")
+
+    def __init__(self, form_cls, query, tables, chart):
+        self.form_cls = form_cls
+        self.query = query
+        self.tables = frozenset(tables)
+        self.chart = chart
+        self.data = None
+
+
+class StatsDashboard(ctk.CTkFrame):
+    """
+    Panel en vivo con todas las gráficas de estadísticas en una sola figura.
+
+    Se actualiza periódicamente y, antes, cuando se notifica un cambio en la
+    base de datos (préstamos, devoluciones, altas y bajas de libros). Ante un
+    cambio solo se vuelven a consultar las gráficas que dependen de la tabla
+    modificada, y solo se redibujan las cuyos datos cambiaron, con blitting
+    de sus barras; la figura completa solo se redibuja si cambian etiquetas
+    o escalas.
+    """
+    REFRESH_MS = 30000   # refresco periódico (cambios de otros puestos)
+    POLL_MS = 500        # comprobación de cambios notificados
+
+    def __init__(self, master, db, panels):
+        """
+        Args:
+            master: Widget padre.
+            db (Database): base de datos (para suscribirse a sus cambios).
+            panels (list): tuplas (clase de BarChartWindow, consulta de Statistics,
+                tablas de las que depende la consulta).
+        """
+        super().__init__(master)
+        self.db = db
+        self.loader = AsyncLoader(self)
+
+        self.figure = Figure(figsize=(12, 7))
+        self.panels = []
+        for i, (form_cls, query, tables) in enumerate(panels):
+            ax = self.figure.add_subplot(2, 3, i + 1)
+            ax.set_title(form_cls.TITLE, fontsize=10)
+            chart = BarChart(ax, form_cls.COLOR, horizontal=form_cls.HORIZONTAL, animated=True)
+            self.panels.append(_Panel(form_cls, query, tables, chart))
+        for i in range(len(panels), 6):
+            self.figure.add_subplot(2, 3, i + 1).axis("off")
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.status = ctk.CTkLabel(self, text="", text_color="gray")
+        self.status.pack(pady=(0, 5))
+
+        self._backgrounds = {}
+        self._changed = set()   # tablas notificadas pendientes de atender
+        self._in_flight = []    # gráficas de la consulta en curso
+        self._last_refresh = 0.0
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.db.subscribe(self._on_change)
+        self._poll_id = self.after(0, self._poll)
+
+
+    def _on_change(self, table: str):
+        # Puede llamarse desde cualquier hilo: solo se anota y lo atiende _poll
+        self._changed.add(table)
+
+
+    def _poll(self):
+        tables = set()
+        while self._changed:
+            tables.add(self._changed.pop())
+        elapsed_ms = (time.monotonic() - self._last_refresh) * 1000
+        if elapsed_ms >= self.REFRESH_MS:
+            self.refresh()
+        elif tables:
+            self.refresh(tables)
+        self._poll_id = self.after(self.POLL_MS, self._poll)
+
+
+    def refresh(self, tables: set[str] | None = None):
+        """
+        Recalcula en segundo plano los datos de las gráficas que dependen de
+        'tables', o de todas si no se indica.
+        """
+        if tables is None:
+            self._last_refresh = time.monotonic()
+        # La consulta en curso se sustituye: sus gráficas se incluyen en la nueva
+        panels = [
+            panel for panel in self.panels
+            if tables is None or panel.tables & tables or panel in self._in_flight
+        ]
+        if not panels:
+            return
+        self._in_flight = panels
+        queries = [panel.query for panel in panels]
+        self.loader.submit(
+            "dashboard",
+            lambda: [query() for query in queries],
+            lambda results: self._apply(panels, results)
+        )
+
+
+    def _apply(self, panels: list[_Panel], results: list):
+        """
+        Actualiza solo las gráficas cuyos datos cambiaron.
+        """
+        self._in_flight = []
+        changed = []
+        relayout = False
+        for panel, data in zip(panels, results):
+            if data == panel.data:
+                continue
+            panel.data = data
+            changed.append(panel)
+            if panel.chart.set_data(*panel.form_cls.labels_values(data)):
+                relayout = True
+
+        if relayout or (changed and not self._backgrounds):
+            self.figure.tight_layout()
+            self.canvas.draw_idle()
+        else:
+            for panel in changed:
+                self._blit(panel)
+
+        stamp = time.strftime("%H:%M:%S")
+        self.status.configure(text=f"Actualizado {stamp} · {len(changed)} gráfica(s) con cambios")
+
+
+    def _on_draw(self, event):
+        """
+        Tras un dibujo completo, guarda el fondo de cada gráfica (sin barras)
+        y dibuja las barras encima.
+        """
+        self._backgrounds = {
+            id(panel): self.canvas.copy_from_bbox(panel.chart.ax.bbox) for panel in self.panels
+        }
+        for panel in self.panels:
+            panel.chart.draw_artists()
+
+
+    def _blit(self, panel: _Panel):
+        """
+        Redibuja solo las barras de una gráfica sobre su fondo guardado.
+        """
+        background = self._backgrounds.get(id(panel))
+        if background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(background)
+        panel.chart.draw_artists()
+        self.canvas.blit(panel.chart.ax.bbox)
+
+
+    def destroy(self):
+        """
+        Detiene los refrescos y libera la figura.
+        """
+        self.after_cancel(self._poll_id)
+        self.loader.cancel()
+        self.db.unsubscribe(self._on_change)
+        self.figure.clear()
+        self._backgrounds = {}
+        super().destroy()
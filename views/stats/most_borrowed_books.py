@@ -1,25 +1,19 @@
-import customtkinter as ctk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from views.stats.chart_window import BarChartWindow
 
-class MostBorrowedBooksForm(ctk.CTkToplevel):
+class MostBorrowedBooksForm(BarChartWindow):
     """
-    Ventana modal para mostrar los Top 10 libros más prestados.
+    Ventana para mostrar los Top 10 libros más prestados.
     """
-    def __init__(self, master, df):
-        super().__init__(master)
-        self.title("📚 Top 10 Libros más Prestados")
-        self.geometry("700x500")
-        self.grab_set()
+    WINDOW_TITLE = "📚 Top 10 Libros más Prestados"
+    TITLE = "Top 10 Libros más Prestados"
+    COLOR = "#4A90E2"
+    XLABEL = "Cantidad de préstamos"
+    YLABEL = "Libro"
 
-        top_books = df['title'].value_counts().head(10)
-        fig, ax = plt.subplots(figsize=(8,5))
-        ax.barh(top_books.index[::-1], top_books.values[::-1], color="#4A90E2")
-        ax.set_xlabel("Cantidad de préstamos")
-        ax.set_ylabel("Libro")
-        ax.set_title("Top 10 Libros más Prestados")
-        plt.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=self)
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-        canvas.draw()
+    @staticmethod
+    def labels_values(data):
+        """
+        Args:
+            data (list): tuplas (title, cantidad) de Statistics.top_books.
+        """
+        return [row[0] for row in data][::-1], [row[1] for row in data][::-1]
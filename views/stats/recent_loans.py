@@ -1,25 +1,24 @@
-import customtkinter as ctk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from views.stats.chart_window import BarChartWindow
 
-class RecentLoansForm(ctk.CTkToplevel):
+class RecentLoansForm(BarChartWindow):
     """
-    Ventana modal para mostrar los últimos 10 préstamos.
+    Ventana para mostrar los últimos 10 préstamos.
     """
-    def __init__(self, master, df):
-        super().__init__(master)
-        self.title("🆕 Últimos 10 Préstamos")
-        self.geometry("700x500")
-        self.grab_set()
+    WINDOW_TITLE = "🆕 Últimos 10 Préstamos"
+    TITLE = "Últimos 10 Préstamos"
+    COLOR = "#BD10E0"
+    XLABEL = "Orden de préstamo"
+    YLABEL = "Libro"
 
-        recent_loans = df.sort_values('loan_date', ascending=False).head(10)
-        fig, ax = plt.subplots(figsize=(8,5))
-        ax.barh(recent_loans['title'][::-1], recent_loans.index[::-1]+1, color="#BD10E0")
-        ax.set_xlabel("Orden de préstamo")
-        ax.set_ylabel("Libro")
-        ax.set_title("Últimos 10 Préstamos")
-        plt.tight_layout()
+    @staticmethod
+    def labels_values(data):
+        """
+        El préstamo más reciente recibe el orden más alto y queda arriba.
 
-        canvas = FigureCanvasTkAgg(fig, master=self)
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-        canvas.draw()
+        Args:
+            data (list): tuplas (title, loan_date) de Statistics.recent_loans,
+                del más reciente al más antiguo.
+        """
+        labels = [f"{row[0]} ({row[1][:10]})" for row in data]
+        order = list(range(len(data), 0, -1))
+        return labels[::-1], order[::-1]
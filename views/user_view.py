@@ -1,15 +1,22 @@
 import customtkinter as ctk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from clases.user import User
 from views.forms.user_form import UserForm
+from views.async_loader import AsyncLoader
+from views.widgets.virtual_tree import VirtualTreeview
 
 class UserView(ctk.CTkFrame):
     """
-    Vista de usuarios que permite crear, listar y borrar (soft delete) usuarios.
+    Vista de usuarios que permite crear, listar, importar desde CSV y borrar
+    (soft delete) usuarios.
     """
+    PROGRESS_MS = 100
+
     def __init__(self, master, db):
         super().__init__(master)
         self.manager = User(db)
+        self.loader = AsyncLoader(self)
+        self._progress = (0, 0)   # (procesados, total), escrito por el hilo de importación
 
         # Configuración del layout
         self.grid_columnconfigure(0, weight=1)
@@ -30,11 +37,21 @@ class UserView(ctk.CTkFrame):
         frame_btn.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
         ctk.CTkButton(frame_btn, text="Nuevo Usuario", command=self.open_form).pack(side="left", padx=5, pady=5)
         ctk.CTkButton(frame_btn, text="🔄 Refrescar", command=self.refresh).pack(side="left", padx=5, pady=5)
+        self.import_button = ctk.CTkButton(frame_btn, text="Importar CSV", command=self.import_csv)
+        self.import_button.pack(side="left", padx=5, pady=5)
+        self.progress_bar = ctk.CTkProgressBar(frame_btn, width=160)
+        self.progress_label = ctk.CTkLabel(frame_btn, text="")
         ctk.CTkButton(frame_btn, text="Borrar Seleccionado", command=self.delete, fg_color="red", hover_color="#A00116", text_color="white").pack(side="right", padx=5, pady=5)
 
-        # Configuración del Treeview.
+        # Configuración del Treeview (virtualizado: solo se cargan las filas visibles).
         cols = ("ID", "Username", "Email")
-        self.tree = ttk.Treeview(self, columns=cols, show="headings")
+        self.table = VirtualTreeview(
+            self,
+            columns=cols,
+            fetch=lambda after, before, limit: self.manager.list(after_id=after, before_id=before, limit=limit),
+            key=lambda user: user.id,
+        )
+        self.tree = self.table.tree
 
         self.tree.column("ID", width=0, minwidth=0, stretch=False)
         self.tree.heading("ID", text="")
@@ -45,7 +62,7 @@ class UserView(ctk.CTkFrame):
         self.tree.column("Email", width=250, anchor="w")
         self.tree.heading("Email", text="Correo Electrónico")
 
-        self.tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.table.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
 
         # Cargar datos
         self.refresh()
@@ -55,9 +72,7 @@ class UserView(ctk.CTkFrame):
         """
         Carga y actualiza la tabla de usuarios.
         """
-        self.tree.delete(*self.tree.get_children())
-        for row in self.manager.list():
-            self.tree.insert("", "end", values=row)
+        self.table.refresh()
 
 
     def open_form(self):
@@ -67,13 +82,76 @@ class UserView(ctk.CTkFrame):
         UserForm(self, self.manager, self.refresh)
 
 
+    def import_csv(self):
+        """
+        Importa usuarios desde un CSV (username,email,password) en segundo
+        plano, mostrando el progreso, y resume los rechazos al terminar.
+        """
+        path = filedialog.askopenfilename(
+            title="Importar usuarios",
+            filetypes=[("CSV", "*.csv"), ("Todos los archivos", "*.*")]
+        )
+        if not path:
+            return
+
+        def run():
+            rows = self.manager.read_csv(path)
+            return self.manager.import_many(rows, progress=self._set_progress)
+
+        self._progress = (0, 0)
+        self.import_button.configure(state="disabled")
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=5, pady=5)
+        self.progress_label.pack(side="left", padx=5, pady=5)
+        self.loader.submit("import", run, self._import_done, self._import_failed)
+        self.after(self.PROGRESS_MS, self._poll_progress)
+
+
+    def _set_progress(self, done: int, total: int):
+        # Se llama desde el hilo de importación: solo se guarda el valor
+        self._progress = (done, total)
+
+
+    def _poll_progress(self):
+        if not self.loader.is_busy():
+            return
+        done, total = self._progress
+        if total:
+            self.progress_bar.set(done / total)
+            self.progress_label.configure(text=f"{done}/{total}")
+        self.after(self.PROGRESS_MS, self._poll_progress)
+
+
+    def _end_import(self):
+        self.import_button.configure(state="normal")
+        self.progress_bar.pack_forget()
+        self.progress_label.pack_forget()
+
+
+    def _import_done(self, results: list):
+        self._end_import()
+        self.refresh()
+        rejected = [(username, error) for username, error in results if error is not True]
+        text = f"Importados {len(results) - len(rejected)} de {len(results)} usuarios."
+        if rejected:
+            lines = [f"{username or '(vacío)'}: {error}" for username, error in rejected[:10]]
+            if len(rejected) > 10:
+                lines.append(f"... y {len(rejected) - 10} más.")
+            text += "\n\nRechazados:\n" + "\n".join(lines)
+        messagebox.showinfo("Importar usuarios", text)
+
+
+    def _import_failed(self, error: Exception):
+        self._end_import()
+        messagebox.showerror("Importar usuarios", str(error))
+
+
     def delete(self):
         """
         Elimina (soft delete) el usuario seleccionado.
         """
-        sel = self.tree.selection()
-        if sel:
-            uid = self.tree.item(sel[0])['values'][0]
+        user = self.table.selected_row()
+        if user is not None:
             if messagebox.askyesno("Confirmar", "¿Borrar usuario?"):
-                self.manager.soft_delete(int(uid))
+                self.manager.soft_delete(user.id)
                 self.refresh()
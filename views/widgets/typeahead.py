@@ -0,0 +1,136 @@
+import tkinter as tk
+import customtkinter as ctk
+from views.async_loader import AsyncLoader
+
+class TypeaheadEntry(ctk.CTkFrame):
+    """
+    Campo de texto con sugerencias: al escribir consulta la capa de datos
+    (con retardo y en segundo plano) y muestra las coincidencias en una
+    lista bajo el campo. Solo se guardan las sugerencias visibles.
+
+    La selección se guarda por ID, por lo que dos opciones con el mismo
+    texto (p. ej. libros con el mismo título) se distinguen.
+    """
+    DELAY_MS = 200
+
+    def __init__(self, master, search, format_option, placeholder: str = "",
+                 limit: int = 20, visible_rows: int = 6, width: int = 220):
+        """
+        Args:
+            master: Widget padre.
+            search: función search(texto, limit) que devuelve registros con
+                atributo 'id' (BookRecord, UserRecord...).
+            format_option: función que convierte un registro en el texto mostrado.
+            placeholder (str): texto de ayuda del campo vacío.
+            limit (int): sugerencias pedidas como máximo.
+            visible_rows (int): alto de la lista de sugerencias.
+            width (int): ancho del campo.
+        """
+        super().__init__(master, fg_color="transparent")
+        self.search = search
+        self.format_option = format_option
+        self.limit = limit
+        self.selected_id = None
+        self.selected_text = ""
+        self._options = []      # (id, texto) de las sugerencias mostradas
+        self._text = ""         # texto del campo en la última consulta o selección
+        self._job = None
+        self.loader = AsyncLoader(self)
+
+        self.grid_columnconfigure(0, weight=1)
+        self.entry = ctk.CTkEntry(self, width=width, placeholder_text=placeholder)
+        self.entry.grid(row=0, column=0, sticky="ew")
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Down>", self._focus_list)
+        self.entry.bind("<Return>", lambda e: self._choose(0))
+
+        self.listbox = tk.Listbox(self, height=visible_rows, exportselection=False)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<Return>", self._on_select)
+
+
+    def get(self) -> int | None:
+        """
+        ID de la opción elegida, o None si no se ha elegido ninguna.
+        """
+        return self.selected_id
+
+
+    def configure_state(self, state: str):
+        """
+        Habilita ("normal") o deshabilita ("disabled") el campo.
+        """
+        self.entry.configure(state=state)
+        if state == "disabled":
+            self._hide()
+
+
+    def _on_key(self, event):
+        # Solo las teclas que cambian el texto (no Shift, flechas, Tab...)
+        text = self.entry.get()
+        if text == self._text:
+            return
+        self._text = text
+        # Editar el texto anula la selección anterior
+        if text != self.selected_text:
+            self.selected_id = None
+        if self._job is not None:
+            self.after_cancel(self._job)
+        self._job = self.after(self.DELAY_MS, self._query)
+
+
+    def _query(self):
+        self._job = None
+        text = self.entry.get().strip()
+        if not text:
+            self.loader.cancel("search")
+            self._show([])
+            return
+        limit = self.limit
+        self.loader.submit("search", lambda: self.search(text, limit), self._show)
+
+
+    def _show(self, rows: list):
+        """
+        Muestra las sugerencias (o oculta la lista si no hay ninguna).
+        """
+        self._options = [(row.id, self.format_option(row)) for row in rows]
+        self.listbox.delete(0, "end")
+        for _, text in self._options:
+            self.listbox.insert("end", text)
+        if self._options:
+            self.listbox.grid(row=1, column=0, sticky="ew")
+        else:
+            self._hide()
+
+
+    def _hide(self):
+        self.listbox.grid_remove()
+
+
+    def _focus_list(self, event=None):
+        if self._options:
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, "end")
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+
+
+    def _on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self._choose(selection[0])
+
+
+    def _choose(self, index: int):
+        """
+        Fija la opción 'index' como seleccionada y cierra la lista.
+        """
+        if index >= len(self._options):
+            return
+        self.selected_id, self.selected_text = self._options[index]
+        self.entry.delete(0, "end")
+        self.entry.insert(0, self.selected_text)
+        self._text = self.selected_text
+        self._hide()
+        self.entry.focus_set()
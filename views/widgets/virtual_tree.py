@@ -0,0 +1,254 @@
+import customtkinter as ctk
+from tkinter import ttk
+from views.async_loader import AsyncLoader
+
+class VirtualTreeview(ctk.CTkFrame):
+    """
+    Treeview virtualizado: mantiene en pantalla una ventana fija de filas y
+    pide páginas a la capa de datos (paginación por clave) al desplazarse.
+
+    La fuente de datos se define con dos funciones:
+        fetch(after, before, limit): filas que siguen a la clave 'after' o
+            preceden a la clave 'before' en el orden mostrado (ambas None
+            para la primera página).
+        key(row): clave de paginación de una fila.
+
+    No se cuenta el total de filas (un COUNT(*) crece con la tabla): el
+    contador muestra la posición de la ventana y si quedan más filas.
+
+    Las consultas se ejecutan en segundo plano con AsyncLoader.
+    """
+    def __init__(self, master, columns, fetch, key, format_row=None,
+                 displaycolumns="#all", page_size: int = 100, window_pages: int = 3):
+        """
+        Construye el Treeview, su barra de desplazamiento y el contador de filas.
+
+        Args:
+            master: Widget padre.
+            columns (tuple): columnas del Treeview.
+            fetch, key: funciones de la fuente de datos (ver clase).
+            format_row: función opcional que transforma una fila en los valores mostrados.
+            displaycolumns: columnas visibles (como en ttk.Treeview).
+            page_size (int): filas pedidas por página.
+            window_pages (int): páginas que se mantienen como máximo en el Treeview.
+        """
+        super().__init__(master, fg_color="transparent")
+        self.fetch = fetch
+        self.key = key
+        self.format_row = format_row or (lambda row: row)
+        self.page_size = page_size
+        self.window_size = page_size * window_pages
+
+        self._rows = []          # filas (sin formatear) de la ventana actual
+        self._offset = 0         # posición de la primera fila de la ventana
+        self._truncated = False  # resultado de show_result cortado en su límite
+        self._at_start = True
+        self._at_end = True
+        self._loading = False
+        self._busy = False
+        self.loader = AsyncLoader(self, on_busy=self._set_busy)
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=columns, displaycolumns=displaycolumns, show="headings")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=self._on_scroll)
+
+        self.status = ctk.CTkLabel(self, text="", anchor="e")
+        self.status.grid(row=1, column=0, columnspan=2, sticky="ew")
+
+
+    def refresh(self):
+        """
+        Recarga desde la primera página en segundo plano. El coste no depende
+        del tamaño de la tabla; un refresco anterior aún en curso se descarta.
+        """
+        self.loader.cancel("page")
+        self._loading = False
+        limit = self.page_size
+        self.loader.submit(
+            "refresh",
+            lambda: self.fetch(None, None, limit),
+            self.load
+        )
+
+
+    def show_result(self, func, limit: int | None = None):
+        """
+        Muestra en segundo plano un resultado completo sin paginar (p. ej. una
+        búsqueda). Sustituye a un refresco en curso y viceversa.
+
+        Args:
+            func: función sin argumentos que devuelve la lista de filas.
+            limit (int | None): máximo de filas que devuelve func; si se
+                alcanza, el contador indica que puede haber más.
+        """
+        def done(rows):
+            self.load(rows)
+            self._at_end = True
+            self._truncated = limit is not None and len(rows) >= limit
+            self._update_status()
+
+        self.loader.cancel("page")
+        self._loading = False
+        self.loader.submit("refresh", func, done)
+
+
+    def load(self, rows: list):
+        """
+        Sustituye la ventana por la primera página ya obtenida.
+        """
+        self._rows = list(rows)
+        self._offset = 0
+        self._truncated = False
+        self._at_start = True
+        self._at_end = len(rows) < self.page_size
+        self._render()
+        self.tree.yview_moveto(0)
+
+
+    def _render(self):
+        """
+        Vuelca la ventana actual en el Treeview y actualiza el contador.
+        """
+        self.tree.delete(*self.tree.get_children())
+        for row in self._rows:
+            self.tree.insert("", "end", values=self.format_row(row))
+        self._update_status()
+
+
+    def _set_busy(self, busy: bool):
+        self._busy = busy
+        self._update_status()
+
+
+    def _update_status(self):
+        first = self._offset + 1
+        last = self._offset + len(self._rows)
+        if not self._rows:
+            text = "Sin registros"
+        elif self._truncated:
+            text = f"Primeros {last} resultados (puede haber más)"
+        elif self._at_end:
+            text = f"Filas {first}–{last} de {last} registros"
+        else:
+            text = f"Filas {first}–{last} (hay más)"
+        if self._busy:
+            text = "⏳ Cargando…   " + text
+        self.status.configure(text=text)
+
+
+    def _on_scroll(self, first, last):
+        """
+        Sincroniza la barra y pide la página vecina al acercarse a un extremo.
+        """
+        self.scrollbar.set(first, last)
+        if self._loading:
+            return
+        first, last = float(first), float(last)
+        if last > 0.9 and not self._at_end:
+            self._load_next()
+        elif first < 0.1 and not self._at_start:
+            self._load_previous()
+
+
+    def _load_next(self):
+        """
+        Pide la página siguiente a la última fila de la ventana.
+        """
+        if self._loading or self._at_end or not self._rows:
+            return
+        self._loading = True
+        after, limit = self.key(self._rows[-1]), self.page_size
+        self.loader.submit(
+            "page",
+            lambda: self.fetch(after, None, limit),
+            self._append_page,
+            self._page_failed
+        )
+
+
+    def _append_page(self, page: list):
+        """
+        Añade la página siguiente al final y descarta filas del principio.
+        """
+        self._loading = False
+        self._at_end = len(page) < self.page_size
+        if not page:
+            return
+        top = self._top_index()
+        self._rows.extend(page)
+        drop = max(0, len(self._rows) - self.window_size)
+        if drop:
+            del self._rows[:drop]
+            self._offset += drop
+            self._at_start = False
+        self._render()
+        self.tree.yview_moveto(max(0, top - drop) / len(self._rows))
+
+
+    def _load_previous(self):
+        """
+        Pide la página anterior a la primera fila de la ventana.
+        """
+        if self._loading or self._at_start or not self._rows:
+            return
+        self._loading = True
+        before, limit = self.key(self._rows[0]), self.page_size
+        self.loader.submit(
+            "page",
+            lambda: self.fetch(None, before, limit),
+            self._prepend_page,
+            self._page_failed
+        )
+
+
+    def _prepend_page(self, page: list):
+        """
+        Añade la página anterior al principio y descarta filas del final.
+        """
+        self._loading = False
+        self._offset = max(0, self._offset - len(page))
+        self._at_start = len(page) < self.page_size or self._offset == 0
+        if not page:
+            return
+        top = self._top_index()
+        self._rows[:0] = page
+        drop = max(0, len(self._rows) - self.window_size)
+        if drop:
+            del self._rows[-drop:]
+            self._at_end = False
+        self._render()
+        self.tree.yview_moveto((top + len(page)) / len(self._rows))
+
+
+    def _page_failed(self, error: Exception):
+        self._loading = False
+        print("[ERROR] Carga de página:", error)
+
+
+    def _top_index(self) -> int:
+        """
+        Índice (dentro de la ventana) de la primera fila visible.
+        """
+        return int(self.tree.yview()[0] * len(self._rows))
+
+
+    def selected_values(self) -> list | None:
+        """
+        Valores mostrados de la fila seleccionada, o None si no hay selección.
+        """
+        sel = self.tree.selection()
+        return self.tree.item(sel[0])['values'] if sel else None
+
+
+    def selected_row(self):
+        """
+        Fila de la capa de datos (sin formatear) seleccionada, o None si no
+        hay selección. Las filas del Treeview siguen el orden de la ventana.
+        """
+        sel = self.tree.selection()
+        return self._rows[self.tree.index(sel[0])] if sel else None